@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+bench-parse-excel.py — Offline benchmark for parse-excel.py.
+
+Generates synthetic Quote Table, Quote Queue and Quote Template workbooks with
+the real sheet names and column layouts at several scales, runs each parser
+stage against them, and saves the timings as JSON:
+
+  profit    — ProfitAnalysis sheet (A–Z), 680 SKU rows per 1x
+  catalog   — TableX sheet (A–AD), 6,100 SKU rows per 1x
+  queue     — Quote Queue (A–G, section-header rows), ~3,630 rows per 1x
+  template  — Dropdown Menus (fixed size; not scaled)
+  metrics   — quote-queue-metrics.json from the queue output
+  entities  — queue-entities.json (dealer / contact resolution) from the queue output
+  columnar  — --columnar companions of every row output
+
+Each stage reports best/median wall and CPU time over --repeat runs, plus
+peak Python allocation (tracemalloc, measured in a separate pass so it does
+not skew the timings). The workbooks are written as raw SpreadsheetML, so
+100x files take seconds to generate instead of minutes through openpyxl.
+
+Usage:
+  python3 scripts/bench-parse-excel.py                      # 1x, 10x, 100x
+  python3 scripts/bench-parse-excel.py --scales 1,10 --repeat 5
+  python3 scripts/bench-parse-excel.py --compare old.json   # flag regressions
+  python3 scripts/bench-parse-excel.py --check              # edge-case checks only
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PARSER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablex_extract.py")
+
+STAGES = ["profit", "catalog", "queue", "template", "metrics", "entities", "index", "rollups", "costmodel", "whatif", "columnar"]
+
+# The whatif stage sweeps these 5 x 5 x 2 = 50 scenarios over the catalog
+WHAT_IF_GRID = {
+    "gpm": [0.30, 0.35, 0.40, 0.45, 0.50],
+    "commission": [0.05, 0.08, 0.10, 0.12, 0.13],
+    "freightOutPct": [0.0, 0.04],
+}
+
+# Row counts of the real workbooks at 1x
+PROFIT_ROWS = 680
+PROFIT_MAX_ROW = 1029      # formula residuals (PKG=15) run to here
+CATALOG_ROWS = 6100
+CATALOG_MAX_ROW = 9068
+QUEUE_YEAR_ROWS = {2023: 1210, 2024: 1215, 2025: 1000, 2026: 205}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# XLSX WRITER — minimal SpreadsheetML package with a shared string table
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_SHEET = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+STYLES_XML = (
+    f'<styleSheet xmlns="{NS_MAIN}">'
+    '<fonts count="1"><font/></fonts><fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs><cellXfs count="1"><xf/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+
+def col_letter(idx):
+    """1-based column index → letters: 1 → A, 30 → AD."""
+    letters = ""
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def write_xlsx(path, sheets):
+    """
+    Write an .xlsx with the given sheets, in order (first = sheet1.xml).
+
+    sheets is a list of (name, rows) where rows yields (row_num, {col: value})
+    with 1-based column indexes. Strings go to sharedStrings.xml, numbers are
+    inline.
+    """
+    strings, index = [], {}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for n, (_, rows) in enumerate(sheets, 1):
+            # Rows are spooled to a temp file first so the <dimension> element
+            # can lead the part; without it openpyxl scans the whole sheet on open.
+            max_row = max_col = 1
+            with tempfile.TemporaryFile() as body:
+                for row_num, cells in rows:
+                    parts = [f'<row r="{row_num}">']
+                    for col in sorted(cells):
+                        value = cells[col]
+                        ref = f"{col_letter(col)}{row_num}"
+                        if isinstance(value, str):
+                            if value not in index:
+                                index[value] = len(strings)
+                                strings.append(value)
+                            parts.append(f'<c r="{ref}" t="s"><v>{index[value]}</v></c>')
+                        else:
+                            parts.append(f'<c r="{ref}"><v>{value!r}</v></c>')
+                    parts.append("</row>")
+                    body.write("".join(parts).encode())
+                    max_row = max(max_row, row_num)
+                    max_col = max(max_col, max(cells, default=1))
+                body.seek(0)
+                with z.open(f"xl/worksheets/sheet{n}.xml", "w") as f:
+                    f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                            f'<worksheet xmlns="{NS_MAIN}">'
+                            f'<dimension ref="A1:{col_letter(max_col)}{max_row}"/>'
+                            f'<sheetData>'.encode())
+                    shutil.copyfileobj(body, f)
+                    f.write(b"</sheetData></worksheet>")
+
+        sst = "".join(f'<si><t xml:space="preserve">{escape(s)}</t></si>' for s in strings)
+        z.writestr("xl/sharedStrings.xml",
+                   f'<sst xmlns="{NS_MAIN}" count="{len(strings)}" '
+                   f'uniqueCount="{len(strings)}">{sst}</sst>')
+        z.writestr("xl/styles.xml", STYLES_XML)
+        z.writestr("xl/workbook.xml",
+                   f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}"><sheets>'
+                   + "".join(f'<sheet name="{escape(name)}" sheetId="{n}" r:id="rId{n}"/>'
+                             for n, (name, _) in enumerate(sheets, 1))
+                   + "</sheets></workbook>")
+        rels = [(f"rId{n}", "worksheet", f"worksheets/sheet{n}.xml")
+                for n in range(1, len(sheets) + 1)]
+        rels += [("rIdStyles", "styles", "styles.xml"),
+                 ("rIdStrings", "sharedStrings", "sharedStrings.xml")]
+        z.writestr("xl/_rels/workbook.xml.rels",
+                   f'<Relationships xmlns="{NS_PKG_REL}">'
+                   + "".join(f'<Relationship Id="{rid}" Type="{NS_REL}/{kind}" Target="{target}"/>'
+                             for rid, kind, target in rels)
+                   + "</Relationships>")
+        z.writestr("_rels/.rels",
+                   f'<Relationships xmlns="{NS_PKG_REL}"><Relationship Id="rId1" '
+                   f'Type="{NS_REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        ct = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+        z.writestr("[Content_Types].xml",
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   f'<Override PartName="/xl/workbook.xml" ContentType="{ct}.sheet.main+xml"/>'
+                   f'<Override PartName="/xl/styles.xml" ContentType="{ct}.styles+xml"/>'
+                   f'<Override PartName="/xl/sharedStrings.xml" ContentType="{ct}.sharedStrings+xml"/>'
+                   + "".join(f'<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="{CT_SHEET}"/>'
+                             for n in range(1, len(sheets) + 1))
+                   + "</Types>")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SYNTHETIC DATA — same layouts as the real workbooks, seeded for repeatability
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+SERIES = ["10", "20", "33", "45", "55", "77", "88", "99"]
+SHAPES = ["TC", "SQ", "RD", "SC", "CS", "HR", "RT", "OV", "KD", "TR"]
+SIZES = ["3030", "3048", "2460", "1860", "4896", "36", "48"]
+BASES = ["T", "U", "X", "QD", "D", "QD16", "U40U18", "T22", "X30"]
+SUFFIXES = ["", "-3P", "-LC", "-SH.28", "-NE", "-FD", "-GR.A", "-PRE", "-OS", "-CH", "-NE-LC"]
+
+STAFF = [("Mark Fleck", "MAF"), ("Samatha Sander", "SS"), ("Maya Mitchell", "MM"), ("Brian Craig", "BC")]
+DEALERS = ["Baldauf", "Business Furnishings", "CRG", "ID+A", "Mitsch Design",
+           "Zimmerman School Equipment", "Business Equipment Company", "Chuckals Office Products",
+           "Kayhan", "Midwest Office", "OfficeWorks", "Facility Matters", "Red Thread"]
+CONTACTS = ["Luke Wagner", "Angela Centanni", "Joe Bernskoetter", "Tracy Wilson", "Kassie Myers",
+            "Alison Duff", "Sharon Zimmerman", "Julie Barrett", "Brent Barrett / Jack Frey"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "June", "July", "Aug", "Sept", "Oct", "Nov", "Dec"]
+
+
+def random_sku(rng, i):
+    return (("SP-" if i % 41 == 0 else "") + rng.choice(SERIES) + rng.choice(SHAPES)
+            + rng.choice(SIZES) + rng.choice(BASES) + rng.choice(SUFFIXES))
+
+
+def _cost_cells(rng, list_price=True):
+    """Top/route/base ... net price block shared by both Quote Table sheets."""
+    top = round(rng.uniform(20, 300), 2)
+    base = round(rng.uniform(50, 400), 2)
+    total = round(top + base + 19, 2)
+    lp = round(total * rng.uniform(2, 4)) if list_price else None
+    return total, [top, None, base, None, None, None, round(top + base, 2), 0.0], lp
+
+
+def profit_rows(rng, scale):
+    yield 1, {1: "Tag", 2: "Qty", 3: "Product", 15: "Total Cost", 22: "List Price", 26: "Notes"}
+    row = 2
+    for i in range(PROFIT_ROWS * scale):
+        total, costs, lp = _cost_cells(rng, list_price=bool(i % 11))
+        cells = {1: f"T{i % 40}", 2: 1, 3: random_sku(rng, i)}
+        cells.update((4 + k, v) for k, v in enumerate(costs) if v is not None)
+        cells.update({13: 4, 14: 15, 15: total, 16: 0.04, 17: round(total * 1.04, 2),
+                      18: 0.5, 19: 0.08, 20: round(total * 2.5, 2), 21: 0.31, 24: 0.68})
+        if lp is not None:
+            cells.update({22: lp, 23: 0.68, 25: round(lp * 0.32, 2)})
+        if i % 9 == 0:
+            cells[26] = "quoted w/ premium laminate"
+        yield row, cells
+        row += 1
+    yield row, {1: "Subtotal"}
+    for row in range(row + 1, PROFIT_MAX_ROW * scale + 1):
+        yield row, {14: 15}
+
+
+def catalog_rows(rng, scale):
+    yield 1, {1: "DATE", 3: "Qty", 4: "Product", 16: "Total Cost", 23: "List Price", 30: "Notes"}
+    row = 2
+    for i in range(CATALOG_ROWS * scale):
+        if i % 997 == 500:
+            yield row, {4: "5% price increase + 7% premium laminate"}
+            row += 1
+        total, costs, lp = _cost_cells(rng, list_price=bool(i % 13))
+        cells = {1: "2026-01-05", 3: 1, 4: random_sku(rng, i)}
+        cells.update((5 + k, v) for k, v in enumerate(costs) if v is not None)
+        cells.update({14: 4, 15: 15, 16: total, 17: 0.04, 18: round(total * 1.04, 2),
+                      19: 0.5, 20: 0.08, 21: round(total * 2.5, 2), 22: 0.31, 27: 12})
+        if i % 3:
+            cells[13] = 1.5
+        if lp is not None:
+            cells.update({23: lp, 24: 0.68, 25: round(lp * 0.32, 2), 26: 0.1})
+        if i % 7 == 0:
+            cells[30] = "note"
+        yield row, cells
+        row += 1
+    for row in range(row, CATALOG_MAX_ROW * scale + 1):
+        yield row, {15: 15, 16: 15}
+
+
+def _queue_stamp(rng, when):
+    """A DATE / TIME REC'D value in one of the formats staff actually type."""
+    hour = when.hour % 12 or 12
+    ampm = "am" if when.hour < 12 else "pm"
+    month = MONTHS[when.month - 1]
+    style = rng.random()
+    if style < 0.80:
+        return f"{month} {when.day} / {hour}:{when.minute:02d}{ampm}"
+    if style < 0.92:
+        return f"{month} {when.day} / {hour}:{when.minute:02d} {ampm.upper()}"
+    if style < 0.97:
+        return f"{month} {when.day} / {hour}{ampm}"
+    return str((when - datetime(1899, 12, 30)).days)  # Excel serial
+
+
+def queue_rows(rng, scale):
+    yield 1, {1: "TABLEX QUOTE QUEUE"}
+    yield 2, dict(enumerate(["EMAIL FROM", "DATE / TIME REC'D", "QUOTE # / EMAIL QUOTE / SO #",
+                             "DEALER / PROJECT NAME", "SPECIAL?", "MAF, SS, or MM?",
+                             "STATUS / COMPLETED"], 1))
+    yield 3, {1: "QUEUE - OPEN QUOTES"}
+    row = 4
+    so_number = 10000
+    for _ in range(scale):
+        for year, count in QUEUE_YEAR_ROWS.items():
+            label = f"COMPLETED ALL {year} QUOTES" + (" BELOW" if year == 2023 else "")
+            yield row, {1: label}
+            row += 1
+            when = datetime(year, 1, 3, 8, 0)
+            step = timedelta(days=360 / count)
+            for i in range(count):
+                when += step + timedelta(minutes=rng.randrange(600))
+                if i % 250 == 249:
+                    row += 1  # blank row
+                staff = rng.choice(STAFF)[1]
+                kind = rng.random()
+                if kind < 0.6:
+                    quote = f"{year % 100}.{staff}.{when.month:02d}{when.day:02d}.{'ABC'[i % 3]}"
+                elif kind < 0.9:
+                    so_number += 1
+                    quote = f"SO#{so_number}"
+                else:
+                    quote = "NONE"
+                done = when + timedelta(hours=rng.randrange(1, 120))
+                cells = {
+                    1: rng.choice(CONTACTS),
+                    2: _queue_stamp(rng, when),
+                    3: quote,
+                    4: f"{rng.choice(DEALERS)} - Project {i % 500}",
+                    5: rng.choice(["YES", "NO", "NO", "-", "Y"]),
+                    6: staff,
+                    7: "no quote" if kind >= 0.9 else _queue_stamp(rng, done),
+                }
+                yield row, cells
+                row += 1
+
+
+def template_rows():
+    for n, (name, initials) in enumerate(STAFF, 1):
+        yield n, {1: name, 2: f"{initials.lower()}@tablex.example"}
+    for n, dealer in enumerate(DEALERS, 7):
+        yield n, {1: dealer, 2: "Data Validation"} if dealer == "CRG" else {1: dealer}
+
+
+def generate_workbooks(src_dir, scale, seed=7):
+    """Write the three source workbooks for one scale; returns their paths."""
+    os.makedirs(src_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = {
+        "table": os.path.join(src_dir, "2026 TableX Quote Table.xlsx"),
+        "queue": os.path.join(src_dir, "2026 QUOTE QUEUE.xlsx"),
+        "template": os.path.join(src_dir, "MAF-2026 Quote Template.xlsx"),
+    }
+    write_xlsx(paths["table"], [("ProfitAnalysis", profit_rows(rng, scale)),
+                                ("TableX", catalog_rows(rng, scale))])
+    write_xlsx(paths["queue"], [("Quote Queue", queue_rows(rng, scale))])
+    write_xlsx(paths["template"], [("Lists", iter(())), ("Dropdown Menus", template_rows())])
+    return paths
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# RUNNER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def load_parser(paths, out_dir):
+    """Load a fresh copy of tablex_extract pointed at the synthetic workbooks."""
+    spec = importlib.util.spec_from_file_location("tablex_extract", PARSER_PATH)
+    px = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(px)
+    px.configure_paths(
+        out_dir=out_dir, table=paths["table"], queue=paths["queue"], template=paths["template"]
+    )
+    os.makedirs(out_dir, exist_ok=True)
+    return px
+
+
+def run_stage(px, stage, reader="iterparse"):
+    """Run one stage with its output silenced; returns its record count(s)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stage == "metrics":
+            return px.parse_queue_metrics()
+        if stage == "entities":
+            return px.parse_queue_entities()
+        if stage == "index":
+            return px.parse_sku_index()
+        if stage == "rollups":
+            return px.parse_margin_rollups()
+        if stage == "costmodel":
+            return px.parse_cost_model_check()
+        if stage == "whatif":
+            scenarios = [
+                dict(zip(WHAT_IF_GRID, values)) for values in itertools.product(*WHAT_IF_GRID.values())
+            ]
+            px.what_if(px._load_output("product-catalog.json"), scenarios)
+            return len(scenarios)
+        if stage == "columnar":
+            for filename in px.COLUMNAR_OUTPUTS:
+                px.write_columnar(filename)
+            return len(px.COLUMNAR_OUTPUTS)
+        parsers = {
+            "profit": px.parse_profit_analysis,
+            "catalog": px.parse_product_catalog,
+            "queue": px.parse_quote_queue,
+            "template": px.parse_template_dropdowns,
+        }
+        with px.WorkbookSession(reader) as session:
+            return parsers[stage](session)
+
+
+def run_pipeline(px, stages, reader="iterparse", measure_memory=False):
+    """Run stages in order; returns {stage: {records, wall, cpu | peakAllocBytes}}."""
+    px.decode_sku.cache_clear()  # every pass starts cold
+    results = {}
+    for stage in stages:
+        if measure_memory:
+            tracemalloc.start()
+            records = run_stage(px, stage, reader)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[stage] = {"records": records, "peakAllocBytes": peak}
+            continue
+        wall, cpu = time.perf_counter(), time.process_time()
+        records = run_stage(px, stage, reader)
+        results[stage] = {
+            "records": records,
+            "wall": time.perf_counter() - wall,
+            "cpu": time.process_time() - cpu,
+        }
+    return results
+
+
+def bench_scale(scale, workdir, stages, repeat, reader="iterparse"):
+    """Generate one scale's workbooks and benchmark every stage against them."""
+    started = time.perf_counter()
+    paths = generate_workbooks(os.path.join(workdir, f"{scale}x", "src"), scale)
+    generate_seconds = time.perf_counter() - started
+    px = load_parser(paths, os.path.join(workdir, f"{scale}x", "out"))
+
+    runs = [run_pipeline(px, stages, reader) for _ in range(repeat)]
+    memory = run_pipeline(px, stages, reader, measure_memory=True)
+
+    report = {
+        "scale": scale,
+        "generateSeconds": round(generate_seconds, 3),
+        "sourceBytes": {os.path.basename(p): os.path.getsize(p) for p in paths.values()},
+        "stages": {},
+    }
+    for stage in stages:
+        walls = [run[stage]["wall"] for run in runs]
+        cpus = [run[stage]["cpu"] for run in runs]
+        report["stages"][stage] = {
+            "records": runs[0][stage]["records"],
+            "wallBest": round(min(walls), 4),
+            "wallMedian": round(statistics.median(walls), 4),
+            "cpuBest": round(min(cpus), 4),
+            "peakAllocBytes": memory[stage]["peakAllocBytes"],
+        }
+    report["totalWallBest"] = round(sum(s["wallBest"] for s in report["stages"].values()), 4)
+    return report
+
+
+def max_rss_bytes():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux reports KB
+
+
+def print_report(report):
+    print(f"\n{report['scale']}x  (workbooks generated in {report['generateSeconds']:.1f}s)")
+    print(f"  {'stage':<10} {'records':>12} {'best s':>9} {'median s':>9} {'cpu s':>9} {'peak MB':>9}")
+    for stage, s in report["stages"].items():
+        records = s["records"]
+        if isinstance(records, (list, tuple)):
+            records = "/".join(str(r) for r in records)
+        print(f"  {stage:<10} {records!s:>12} {s['wallBest']:>9.3f} {s['wallMedian']:>9.3f} "
+              f"{s['cpuBest']:>9.3f} {s['peakAllocBytes'] / 1e6:>9.1f}")
+
+
+def compare(baseline, results, threshold):
+    """Print best-wall deltas against a previous results file; returns regressions."""
+    old = {r["scale"]: r for r in baseline["scales"]}
+    regressions = []
+    print(f"\nCompared with {baseline.get('generatedAt', 'baseline')} (threshold {threshold:.0%}):")
+    for report in results["scales"]:
+        before = old.get(report["scale"])
+        if before is None:
+            continue
+        for stage, s in report["stages"].items():
+            prev = before["stages"].get(stage)
+            if not prev or not prev["wallBest"]:
+                continue
+            change = s["wallBest"] / prev["wallBest"] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append((report["scale"], stage, change))
+            print(f"  {report['scale']:>4}x {stage:<10} {prev['wallBest']:>9.3f} → "
+                  f"{s['wallBest']:>9.3f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CHECKS (--check) — small hand-built workbooks for layouts the benchmark
+# data doesn't cover; each check returns a list of failure messages
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def check_year_rollover(workdir):
+    """A quote received Dec 30 and finished Jan 2 took 65 hours, not 363 days."""
+    paths = generate_workbooks(os.path.join(workdir, "src"), 1)
+    write_xlsx(paths["queue"], [("Quote Queue", [
+        (2, {1: "EMAIL FROM", 2: "DATE / TIME REC'D", 7: "STATUS / COMPLETED"}),
+        (3, {1: "COMPLETED ALL 2025 QUOTES"}),
+        (4, {1: "Luke Wagner", 2: "Dec 30 / 4:00pm", 3: "25.MAF.1230.A",
+             4: "Baldauf - Project 1", 6: "MAF", 7: "Jan 2 / 9:00am"}),
+        (5, {1: "Luke Wagner", 2: "Dec 30 / 4:00pm", 3: "25.MAF.1230.B",
+             4: "Baldauf - Project 2", 6: "MAF", 7: "Dec 29 / 9:00am"}),
+    ])])
+    px = load_parser(paths, os.path.join(workdir, "out"))
+    run_stage(px, "queue")
+    run_stage(px, "metrics")
+    with open(os.path.join(workdir, "out", "quote-queue-metrics.json")) as f:
+        overall = json.load(f)["turnaroundTimes"]["overall"]
+    failures = []
+    if overall["count"] != 1:
+        failures.append(f"expected the status-before-receipt row to be skipped, got {overall['count']} spans")
+    if overall["maxHours"] != 65.0:
+        failures.append(f"Dec 30 4pm → Jan 2 9am should be 65.0 hours, got {overall['maxHours']}")
+    return failures
+
+
+def _with_gap(rows, at, gap, filler):
+    """Shift rows from `at` down by `gap`, filling the hole with SKU-less filler rows."""
+    for row, cells in rows:
+        if row == at:
+            for hole in range(at, at + gap):
+                yield hole, dict(filler)
+        yield (row + gap if row >= at else row), cells
+
+
+def check_resume_after_gap(workdir):
+    """Quote Table data that resumes after 300 SKU-less rows is still read, serially and in --jobs chunks."""
+    def skus(table):
+        paths = generate_workbooks(os.path.join(workdir, table, "src"), 1)
+        if table == "gapped":
+            rng = random.Random(7)  # same seed, so the same rows as the plain workbook
+            write_xlsx(paths["table"], [
+                ("ProfitAnalysis", _with_gap(profit_rows(rng, 1), 300, 300, {14: 15})),
+                ("TableX", _with_gap(catalog_rows(rng, 1), 3000, 300, {15: 15, 16: 15})),
+            ])
+        px = load_parser(paths, os.path.join(workdir, table, "out"))
+        with px.WorkbookSession() as session:
+            profit = [r.sku for r in px.extract_profit_analysis(session)]
+            catalog = [r.sku for r in px.extract_product_catalog(session)]
+        chunked = []
+        for chunk in px._catalog_chunks(3, 2, px._catalog_last_row("iterparse")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                records, _, _ = px._run_extract_job("catalog", chunk, "iterparse")
+            chunked += [r["sku"] for r in records]
+        return profit, catalog, chunked
+
+    plain_profit, plain_catalog, _ = skus("plain")
+    profit, catalog, chunked = skus("gapped")
+    failures = []
+    if profit != plain_profit:
+        failures.append(f"ProfitAnalysis: {len(profit)} rows after a gap at row 300, expected {len(plain_profit)}")
+    if catalog != plain_catalog:
+        failures.append(f"TableX: {len(catalog)} rows after a gap at row 3000, expected {len(plain_catalog)}")
+    if chunked != catalog:
+        failures.append(f"TableX in 3 chunks: {len(chunked)} rows, serial read {len(catalog)}")
+    return failures
+
+
+CHECKS = {
+    "rollover": check_year_rollover,
+    "gap": check_resume_after_gap,
+}
+
+
+def run_checks(workdir):
+    """Run every check in its own directory under workdir; returns the failure count."""
+    failed = 0
+    for name, check in CHECKS.items():
+        failures = check(os.path.join(workdir, "check-" + name))
+        print(f"  {name:<10} {'FAIL' if failures else 'ok'}")
+        for message in failures:
+            print(f"    {message}")
+        failed += bool(failures)
+    return failed
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# MAIN
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parse-excel.py on synthetic workbooks.")
+    parser.add_argument(
+        "--scales", default="1,10,100",
+        help="comma-separated scale factors (default 1,10,100)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, metavar="N",
+        help="timed runs per scale; best and median are reported (default 3)",
+    )
+    parser.add_argument(
+        "--stages", default=",".join(STAGES),
+        help=f"comma-separated stages to run, in order (default {','.join(STAGES)})",
+    )
+    parser.add_argument(
+        "--reader", choices=["iterparse", "dom", "openpyxl"], default="iterparse",
+        help="sheet reader to benchmark (default iterparse; see parse-excel.py --dom/--openpyxl)",
+    )
+    parser.add_argument(
+        "--output", default="parse-excel-bench.json", metavar="FILE",
+        help="where to save the results JSON (default ./parse-excel-bench.json)",
+    )
+    parser.add_argument(
+        "--compare", metavar="FILE",
+        help="previous results JSON; exit 1 if any stage got slower than --threshold",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="relative slowdown counted as a regression by --compare (default 0.10)",
+    )
+    parser.add_argument(
+        "--keep", metavar="DIR",
+        help="generate workbooks and outputs under DIR and keep them",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="run the edge-case checks instead of the benchmark; exit 1 if any fail",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        workdir = args.keep or tempfile.mkdtemp(prefix="parse-excel-check-")
+        print("Checks:")
+        try:
+            failed = run_checks(workdir)
+        finally:
+            if not args.keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+        sys.exit(1 if failed else 0)
+
+    scales = [int(s) for s in args.scales.split(",")]
+    stages = args.stages.split(",")
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="parse-excel-bench-")
+    results = {
+        "generatedAt": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "reader": args.reader,
+        "scales": [],
+    }
+    try:
+        for scale in scales:
+            report = bench_scale(scale, workdir, stages, args.repeat, reader=args.reader)
+            results["scales"].append(report)
+            print_report(report)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    results["maxRssBytes"] = max_rss_bytes()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
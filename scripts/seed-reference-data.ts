@@ -2,13 +2,21 @@
  * Seed reference data into Supabase from JSON files.
  *
  * Usage:
- *   npx tsx scripts/seed-reference-data.ts
+ *   npx tsx scripts/seed-reference-data.ts            # full reseed
+ *   npx tsx scripts/seed-reference-data.ts --changes  # apply <name>.changes.json only
+ *
+ * --changes applies the change-sets parse-excel.py writes next to each JSON
+ * file (see its CHANGE-SETS section). A table whose change-set is missing or
+ * is a baseline (never seeded before) is fully reseeded. After each table is
+ * seeded or applied, its hashes move from .changeset-pending.json into
+ * .changeset-state.json, so the next extraction diffs against what the
+ * database now holds.
  *
  * Requires NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env.local
  */
 
 import { createClient } from "@supabase/supabase-js";
-import { readFileSync } from "fs";
+import { readFileSync, renameSync, writeFileSync } from "fs";
 import { join } from "path";
 import { config } from "dotenv";
 
@@ -139,20 +147,125 @@ async function seedTable(tableName: string, data: Record<string, unknown>[], bat
   console.log(`  Done: ${inserted} rows inserted.`);
 }
 
+const applyChanges = process.argv.includes("--changes");
+
+// Natural-key fields used by the change-sets, and their columns
+const KEY_COLUMNS: Record<string, string> = {
+  sku: "sku",
+  quoteNumber: "quote_number",
+  rowNum: "row_num",
+  name: "name",
+};
+
+interface ChangeSet {
+  format: "changeset-v1";
+  table: string;
+  baseline: boolean;
+  inserts: Record<string, unknown>[];
+  updates: Record<string, unknown>[];
+  deletes: Record<string, unknown>[];
+  counts: { inserts: number; updates: number; deletes: number };
+}
+
+function loadChangeSet(filename: string): ChangeSet | null {
+  try {
+    return loadJson(filename.replace(".json", ".changes.json")) as ChangeSet;
+  } catch {
+    return null;
+  }
+}
+
+async function applyChangeSet(
+  changes: ChangeSet,
+  keyFields: string[],
+  mapRow: (row: Record<string, unknown>) => Record<string, unknown>,
+  batchSize = 500
+) {
+  const { table, counts } = changes;
+  console.log(`Applying ${table}: +${counts.inserts} ~${counts.updates} -${counts.deletes}`);
+  const rows = [...changes.inserts, ...changes.updates];
+
+  // Delete every affected key group (deleted, updated, and re-inserted keys),
+  // so applying the same change-set twice leaves the same rows
+  const keys = new Map<string, Set<unknown>>();
+  const addKey = (field: string, value: unknown) => {
+    if (!keys.has(field)) keys.set(field, new Set());
+    keys.get(field)!.add(value);
+  };
+  for (const key of changes.deletes) {
+    for (const [field, value] of Object.entries(key)) addKey(field, value);
+  }
+  for (const row of rows) {
+    const field = keyFields.find((f) => row[f] !== undefined && row[f] !== null && row[f] !== "")!;
+    addKey(field, row[field]);
+  }
+  for (const [field, values] of keys) {
+    const all = [...values];
+    for (let i = 0; i < all.length; i += batchSize) {
+      const { error } = await supabase.from(table).delete().in(KEY_COLUMNS[field], all.slice(i, i + batchSize));
+      if (error) throw error;
+    }
+  }
+
+  for (let i = 0; i < rows.length; i += batchSize) {
+    const { error } = await supabase.from(table).insert(rows.slice(i, i + batchSize).map(mapRow));
+    if (error) {
+      console.error(`  Error inserting batch at offset ${i}:`, error.message);
+      throw error;
+    }
+  }
+  console.log(`  Done: ${rows.length} rows written.`);
+}
+
+// Record that a table now matches the JSON the extractor last diffed, so its
+// next change-set is relative to this seed
+function markSeeded(table: string) {
+  let pending: { tables: Record<string, unknown> };
+  try {
+    pending = loadJson(".changeset-pending.json");
+  } catch {
+    return; // no extraction has written change-set state yet
+  }
+  if (!(table in pending.tables)) return;
+  let state: { format: string; tables: Record<string, unknown> };
+  try {
+    state = loadJson(".changeset-state.json");
+  } catch {
+    state = { format: "changeset-v1", tables: {} };
+  }
+  state.tables[table] = pending.tables[table];
+  const path = join(dataDir, ".changeset-state.json");
+  writeFileSync(`${path}.tmp`, JSON.stringify(state));
+  renameSync(`${path}.tmp`, path);
+}
+
+// Full reseed, or with --changes just the change-set when there is a usable one
+async function seedOrApply(
+  tableName: string,
+  filename: string,
+  keyFields: string[],
+  mapRow: (row: Record<string, unknown>) => Record<string, unknown> = (row) => row
+) {
+  const changes = applyChanges ? loadChangeSet(filename) : null;
+  if (changes && !changes.baseline) {
+    await applyChangeSet(changes, keyFields, mapRow);
+  } else {
+    await seedTable(tableName, loadJson(filename).map(mapRow));
+  }
+  markSeeded(tableName);
+}
+
 async function main() {
   console.log("=== TableX Reference Data Seeder ===\n");
 
   // 1. Product Catalog (6,098 rows)
-  const catalog = loadJson("product-catalog.json");
-  await seedTable("product_catalog", catalog.map(mapProductCatalog));
+  await seedOrApply("product_catalog", "product-catalog.json", ["sku"], mapProductCatalog);
 
   // 2. Profit Analysis (589 rows)
-  const profit = loadJson("profit-analysis.json");
-  await seedTable("profit_analysis", profit.map(mapProfitAnalysis));
+  await seedOrApply("profit_analysis", "profit-analysis.json", ["sku"], mapProfitAnalysis);
 
   // 3. Quote Queue (3,595 rows)
-  const queue = loadJson("quote-queue.json");
-  await seedTable("quote_queue", queue.map(mapQuoteQueue));
+  await seedOrApply("quote_queue", "quote-queue.json", ["quoteNumber", "rowNum"], mapQuoteQueue);
 
   // 4. Quote Queue Metrics (1 row, JSONB)
   const metrics = loadJson("quote-queue-metrics.json");
@@ -165,12 +278,10 @@ async function main() {
   console.log("  Done.");
 
   // 5. Staff (4 rows)
-  const staff = loadJson("staff.json");
-  await seedTable("staff", staff);
+  await seedOrApply("staff", "staff.json", ["name"]);
 
   // 6. Dealers (13 rows)
-  const dealers = loadJson("dealers.json");
-  await seedTable("dealers", dealers);
+  await seedOrApply("dealers", "dealers.json", ["name"]);
 
   console.log("\n=== All reference data seeded successfully! ===");
 }
@@ -0,0 +1,4397 @@
+#!/usr/bin/env python3
+"""
+tablex_extract — Extract data from TableX's Excel files to JSON for the dashboard.
+
+scripts/parse-excel.py is the command-line wrapper around main(). Imported,
+the module reads nothing until called (schemas and discount tiers load on
+first use; gzip, sqlite3, process pools and openpyxl only when a code path
+needs them), and the extract_* parsers yield namedtuple records:
+
+    import tablex_extract as tx
+    tx.configure_paths(table="Quote Table.xlsx")
+    with tx.WorkbookSession() as session:
+        for rec in tx.extract_product_catalog(session):
+            print(rec.sku, rec.listPrice)
+
+Source: /Users/dannybreckenridge/Documents/Clear ph/Clients/TableX/Claude/Quoting Docs and Sheets/
+Output: /Users/dannybreckenridge/Applications/tablex-quoting-dashboard/src/data/
+
+Outputs:
+  1. profit-analysis.json  — ProfitAnalysis sheet from Quote Table (~680 valid rows)
+  2. product-catalog.json   — TableX sheet from Quote Table (~6,100 valid rows)
+  3. quote-queue.json       — Quote Queue (~3,635 data rows)
+  4. staff.json             — Staff list from Quote Template
+  5. dealers.json           — Dealer list from Quote Template
+  6. quote-queue-metrics.json — Turnaround, staff, growth and dealer metrics from the queue
+  7. sku-index.json         — SKU → record offsets, facets and type-ahead prefixes
+  8. margin-rollups.json    — index of GPM / net profit / tier margin cubes by series, shape, size,
+                              base; one file per cube under margin-rollups/
+  9. cost-model-check.json  — rows whose cached cost / price formulas disagree with the cost model
+ 10. queue-entities.json    — queue dealers and contacts resolved across spellings, ID per row
+
+With --what-if FILE the cost model reprices the catalog under each scenario in FILE.
+
+With --sqlite FILE the same datasets are also loaded into a local SQLite database.
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter, namedtuple
+from contextlib import ExitStack, contextmanager, nullcontext
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import combinations, product
+
+# ── Paths ────────────────────────────────────────────────────────────────────
+
+# Overridable with TABLEX_SRC_DIR / TABLEX_OUT_DIR, or --src-dir / --out-dir and
+# the per-workbook flags (see configure_paths)
+SRC_DIR = os.environ.get(
+    "TABLEX_SRC_DIR",
+    "/Users/dannybreckenridge/Documents/Clear ph/Clients/TableX/Claude/Quoting Docs and Sheets",
+)
+OUT_DIR = os.environ.get(
+    "TABLEX_OUT_DIR",
+    "/Users/dannybreckenridge/Applications/tablex-quoting-dashboard/src/data",
+)
+
+QUOTE_TABLE_FILE = "2026 TableX Quote Table.xlsx"
+QUOTE_QUEUE_FILE = "2026 QUOTE QUEUE.xlsx"
+QUOTE_TEMPLATE_FILE = "MAF-2026 Quote Template.xlsx"
+
+QUOTE_TABLE_PATH = os.path.join(SRC_DIR, QUOTE_TABLE_FILE)
+QUOTE_QUEUE_PATH = os.path.join(SRC_DIR, QUOTE_QUEUE_FILE)
+QUOTE_TEMPLATE_PATH = os.path.join(SRC_DIR, QUOTE_TEMPLATE_FILE)
+
+# Source fingerprints from the last successful run (see INCREMENTAL section)
+MANIFEST_PATH = os.path.join(OUT_DIR, ".extract-manifest.json")
+
+# Bump when a parser change alters its output, so unchanged sources re-extract
+PARSER_VERSION = 3
+
+
+# ── Instrumentation (--profile) ──────────────────────────────────────────────
+#
+# PROFILER attributes wall and CPU time to named stages within each extractor
+# ("workbook open", "row iteration", "sku decode", "write", ...). Stages nest,
+# and time is charged only to the innermost open stage, so an extractor's
+# stages add up to its total; time outside any named stage lands in "other".
+# Under --tracemalloc each stage also records the high-water mark of traced
+# memory (absolute, not a delta) reached while it was open. Timers are no-ops
+# without --profile.
+#
+# Skip counters (rows dropped per filter rule) are always on: they are cheap,
+# and the same numbers explain a surprising record count without a re-run.
+
+class _Stage:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler._pop()
+        return False
+
+
+class Profiler:
+    """Per-extractor stage timers and skip counters; see PROFILER."""
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self._extractors = {}
+        self._current = None  # extractor name while inside extractor()
+        self._stack = []      # open stage entries, innermost last
+        self._mark = (0.0, 0.0)
+
+    def configure(self, enabled, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        if self.trace_memory:
+            import tracemalloc  # only --tracemalloc needs it
+
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def _extractor(self, name):
+        if name not in self._extractors:
+            self._extractors[name] = {"wall": 0.0, "cpu": 0.0, "skipped": {}, "stages": {}}
+        return self._extractors[name]
+
+    def _charge(self):
+        """Charge time since the last transition to the innermost open stage."""
+        now = (time.perf_counter(), time.process_time())
+        if self._stack:
+            entry = self._stack[-1]
+            entry["wall"] += now[0] - self._mark[0]
+            entry["cpu"] += now[1] - self._mark[1]
+            if self.trace_memory:
+                peak = self._tracemalloc.get_traced_memory()[1]
+                for open_entry in self._stack:
+                    open_entry["peakAllocBytes"] = max(open_entry["peakAllocBytes"], peak)
+                self._tracemalloc.reset_peak()
+        self._mark = now
+
+    def _push(self, name):
+        self._charge()
+        stages = self._extractor(self._current)["stages"]
+        entry = stages.get(name)
+        if entry is None:
+            entry = stages[name] = {"calls": 0, "wall": 0.0, "cpu": 0.0, "peakAllocBytes": 0}
+        entry["calls"] += 1
+        self._stack.append(entry)
+
+    def _pop(self):
+        self._charge()
+        self._stack.pop()
+
+    @contextmanager
+    def extractor(self, name):
+        """Scope stage timings (and the total) to one extractor."""
+        if not self.enabled:
+            yield
+            return
+        self._charge()
+        outer, outer_stack = self._current, self._stack
+        self._current, self._stack = name, []
+        start = (time.perf_counter(), time.process_time())
+        self._push("other")
+        try:
+            yield
+        finally:
+            self._pop()
+            totals = self._extractor(name)
+            totals["wall"] += time.perf_counter() - start[0]
+            totals["cpu"] += time.process_time() - start[1]
+            self._current, self._stack = outer, outer_stack
+
+    def stage(self, name):
+        """Context manager timing one stage of the current extractor."""
+        if not self.enabled or self._current is None:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def iterate(self, name, iterable):
+        """Wrap iterable so the time spent producing each item counts as stage name."""
+        if not self.enabled or self._current is None:
+            return iterable
+        return self._timed_iter(name, iter(iterable))
+
+    def _timed_iter(self, name, it):
+        while True:
+            with _Stage(self, name):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def skip(self, extractor, rule):
+        """Count one row dropped by a filter rule."""
+        skipped = self._extractor(extractor)["skipped"]
+        skipped[rule] = skipped.get(rule, 0) + 1
+
+    def take(self):
+        """Return and reset the collected stats (pool workers ship these home)."""
+        collected, self._extractors = self._extractors, {}
+        return collected
+
+    def merge(self, collected):
+        """Fold stats returned by take() in another process into this one."""
+        for name, theirs in collected.items():
+            ours = self._extractor(name)
+            ours["wall"] += theirs["wall"]
+            ours["cpu"] += theirs["cpu"]
+            for rule, n in theirs["skipped"].items():
+                ours["skipped"][rule] = ours["skipped"].get(rule, 0) + n
+            for stage, entry in theirs["stages"].items():
+                mine = ours["stages"].setdefault(
+                    stage, {"calls": 0, "wall": 0.0, "cpu": 0.0, "peakAllocBytes": 0}
+                )
+                mine["calls"] += entry["calls"]
+                mine["wall"] += entry["wall"]
+                mine["cpu"] += entry["cpu"]
+                mine["peakAllocBytes"] = max(mine["peakAllocBytes"], entry["peakAllocBytes"])
+
+    def report(self, counts):
+        """The machine-readable --profile report."""
+        extractors = {}
+        for name, stats in self._extractors.items():
+            stages = {
+                stage: {
+                    "calls": entry["calls"],
+                    "wallSeconds": round(entry["wall"], 6),
+                    "cpuSeconds": round(entry["cpu"], 6),
+                    "peakAllocBytes": entry["peakAllocBytes"] if self.trace_memory else None,
+                }
+                for stage, entry in sorted(stats["stages"].items(), key=lambda kv: -kv[1]["wall"])
+            }
+            extractors[name] = {
+                "records": counts.get(name),
+                "wallSeconds": round(stats["wall"], 6),
+                "cpuSeconds": round(stats["cpu"], 6),
+                "skipped": stats["skipped"],
+                "stages": stages,
+            }
+        return {
+            "format": "extract-profile-v1",
+            "generatedAt": datetime.now().isoformat(timespec="seconds"),
+            "parserVersion": PARSER_VERSION,
+            "traceMemory": self.trace_memory,
+            "extractors": extractors,
+        }
+
+
+_NULL_STAGE = nullcontext()
+PROFILER = Profiler()
+
+
+# ── Output writers ───────────────────────────────────────────────────────────
+
+# Also write <name>.ndjson (one compact record per line) next to each JSON
+# array output; set from --ndjson.
+WRITE_NDJSON = False
+
+
+class AtomicOutput:
+    """
+    Context manager that writes a file through a temp file in the same
+    directory and os.replace()s it into place on success, so readers never
+    see a half-written file in src/data. If the finished file is
+    byte-identical to the existing one, the existing file is left untouched
+    (changed=False) and downstream builds see no churn. On error the temp
+    file is removed and the old file survives. Each file is swapped on its
+    own; every path replaced in this process is appended to
+    AtomicOutput.replaced, so a failed --watch cycle can say which outputs
+    it had already written.
+    """
+
+    replaced = []
+
+    def __init__(self, path, binary=False):
+        self.path = path
+        self.tmp_path = os.path.join(
+            os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp"
+        )
+        self.binary = binary
+        self.changed = None
+
+    def __enter__(self):
+        with PROFILER.stage("write"):
+            self.file = open(self.tmp_path, "wb" if self.binary else "w")
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        with PROFILER.stage("write"):
+            self.file.close()
+            if exc_type is not None:
+                os.remove(self.tmp_path)
+                return False
+            if os.path.exists(self.path) and filecmp.cmp(self.tmp_path, self.path, shallow=False):
+                os.remove(self.tmp_path)
+                self.changed = False
+            else:
+                os.replace(self.tmp_path, self.path)
+                self.changed = True
+                AtomicOutput.replaced.append(self.path)
+        return False
+
+
+def _as_json(record):
+    """Record namedtuples serialize as objects, like the dicts they replaced."""
+    return record._asdict() if isinstance(record, tuple) else record
+
+
+def _indented_item(record):
+    """A record as it appears inside a json.dumps(list, indent=2) array."""
+    return "  " + json.dumps(_as_json(record), indent=2, default=str).replace("\n", "\n  ")
+
+
+def write_json(records, filename):
+    """
+    Stream records (any iterable) to a JSON array file in the output directory.
+
+    Records are serialized one at a time, so memory stays bounded by a single
+    record no matter how large the extractor's output is; the bytes are the
+    same as json.dump(list(records), f, indent=2). With WRITE_NDJSON a
+    <name>.ndjson companion is written in the same pass. Returns the count.
+    """
+    path = os.path.join(OUT_DIR, filename)
+    outputs = [AtomicOutput(path)]
+    if WRITE_NDJSON:
+        outputs.append(AtomicOutput(path[:-len(".json")] + ".ndjson"))
+
+    count = 0
+    with ExitStack() as stack:
+        files = [stack.enter_context(out) for out in outputs]
+        f = files[0]
+        nd = files[1] if len(files) > 1 else None
+        for record in records:
+            with PROFILER.stage("serialization"):
+                text = _indented_item(record)
+                line = json.dumps(_as_json(record), default=str) if nd is not None else None
+            with PROFILER.stage("write"):
+                f.write(",\n" if count else "[\n")
+                f.write(text)
+                if nd is not None:
+                    nd.write(line)
+                    nd.write("\n")
+            count += 1
+        f.write("\n]" if count else "[]")
+
+    action = "Wrote" if outputs[0].changed else "Unchanged"
+    print(f"  -> {action} {filename}: {count} records")
+    return count
+
+
+def _write_if_changed(path, data):
+    """Atomically write bytes to path unless it already holds them; True if written."""
+    out = AtomicOutput(path, binary=True)
+    with out as f:
+        f.write(data)
+    return out.changed
+
+
+def write_json_document(data, path):
+    """Atomically write a single JSON document (metrics, manifest, state files)."""
+    with PROFILER.stage("serialization"):
+        text = json.dumps(data, indent=2, default=str)
+    out = AtomicOutput(path)
+    with out as f:
+        with PROFILER.stage("write"):
+            f.write(text)
+    return out.changed
+
+
+def _read_text(path):
+    """Return the contents of path, or None if it doesn't exist."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# ── Workbook session ─────────────────────────────────────────────────────────
+
+READERS = ("iterparse", "dom", "openpyxl")
+
+
+class WorkbookSession:
+    """
+    Opens each source .xlsx at most once per run and hands the same handle to
+    every sheet parser that needs it.
+
+    rows(path, sheet, ...) is the one way parsers read a sheet. The sheet is
+    resolved by name (or position) through workbook.xml and its relationships,
+    and its <row> elements are decoded straight into tuples with no per-cell
+    objects. Cached per workbook path:
+      - archive(path):         the zipfile handle
+      - shared_strings(path):  decoded sharedStrings.xml table
+      - sheet_parts(path):     [(sheet name, worksheet part)] in workbook order
+      - layout(path, schema):  a sheet schema resolved against its header row
+
+    Open cost (unzip + workbook/shared-string decode) is recorded per workbook
+    so the run summary can report it.
+
+    reader picks how worksheet parts are decoded: "iterparse" streams them
+    (default), "dom" uses a whole-tree ET.parse for comparison, and
+    "openpyxl" falls back to openpyxl read-only iteration for the Quote Table
+    and Template sheets (the queue is always read as raw XML; its stylesheet
+    trips openpyxl).
+    """
+
+    NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+    def __init__(self, reader="iterparse"):
+        if reader not in READERS:
+            raise ValueError(f"Unknown reader {reader!r}; expected one of {READERS}")
+        self.dom = reader == "dom"
+        self.use_openpyxl = reader == "openpyxl"
+        self._workbooks = {}
+        self._archives = {}
+        self._shared_strings = {}
+        self._sheet_parts = {}
+        self._layouts = {}
+        self.open_costs = {}  # path -> seconds spent opening / decoding
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _timed(self, path, fn, stage="workbook open"):
+        start = time.perf_counter()
+        with PROFILER.stage(stage):
+            result = fn()
+        self.open_costs[path] = self.open_costs.get(path, 0.0) + time.perf_counter() - start
+        return result
+
+    def workbook(self, path):
+        """Return the shared openpyxl workbook for path, loading it on first use."""
+        if path not in self._workbooks:
+            with PROFILER.stage("workbook open"):
+                import openpyxl  # optional: only the openpyxl reader needs it
+
+            self._workbooks[path] = self._timed(
+                path, lambda: openpyxl.load_workbook(path, read_only=True, data_only=True)
+            )
+        return self._workbooks[path]
+
+    def archive(self, path):
+        """Return the shared zipfile handle for path, opening it on first use."""
+        if path not in self._archives:
+            self._archives[path] = self._timed(path, lambda: zipfile.ZipFile(path, "r"))
+        return self._archives[path]
+
+    def shared_strings(self, path):
+        """Return the decoded shared-string table for path, parsing it on first use."""
+        if path not in self._shared_strings:
+            z = self.archive(path)
+            reader = _read_shared_strings_dom if self.dom else _read_shared_strings
+            self._shared_strings[path] = self._timed(path, lambda: reader(z), "shared strings")
+        return self._shared_strings[path]
+
+    def sheet_parts(self, path):
+        """Return [(sheet name, worksheet part)] for path in workbook order."""
+        if path not in self._sheet_parts:
+            z = self.archive(path)
+            self._sheet_parts[path] = self._timed(path, lambda: _read_sheet_parts(z))
+        return self._sheet_parts[path]
+
+    def layout(self, path, schema):
+        """Return the SheetLayout of a sheet schema (see resolve_layout), resolving it on first use."""
+        key = (path, json.dumps(schema, sort_keys=True))
+        if key not in self._layouts:
+            self._layouts[key] = self._timed(path, lambda: resolve_layout(self, path, schema), "header detection")
+        return self._layouts[key]
+
+    def sheet_member(self, path, sheet):
+        """Resolve a sheet name, or 0-based position, to its worksheet part."""
+        parts = self.sheet_parts(path)
+        if isinstance(sheet, int):
+            return parts[sheet][1]
+        for name, member in parts:
+            if name == sheet:
+                return member
+        raise KeyError(f"No sheet named {sheet!r} in {os.path.basename(path)}")
+
+    def rows(self, path, sheet, min_row=1, max_row=None, max_col=None, typed=True,
+             columns=None, key=None):
+        """
+        Yield (row_num, values) for each row of a sheet in [min_row, max_row].
+
+        values is a tuple indexed by 0-based column (A = 0), padded with None
+        to max_col; cells past max_col are never decoded, and the worksheet
+        stops being read once max_row is passed. Rows missing from the sheet
+        are not yielded. typed=True casts numbers and booleans the way
+        openpyxl does; typed=False leaves every value as its XML text.
+
+        columns is an optional projection: only those 0-based columns are
+        decoded, the rest stay None. key=(col, accept) decodes that one cell
+        first and drops the row unless accept(value) is true, before any other
+        cell is touched.
+        """
+        if columns is not None:
+            columns = frozenset(columns)
+        if self.use_openpyxl and typed:
+            rows = self._openpyxl_rows(path, sheet, min_row, max_row, max_col, columns, key)
+        else:
+            z = self.archive(path)
+            strings = self.shared_strings(path)
+            member = self.sheet_member(path, sheet)
+            reader = _iter_sheet_rows_dom if self.dom else _iter_sheet_rows
+            rows = reader(z, member, strings, min_row, max_row, max_col, typed, columns, key)
+        return PROFILER.iterate("row iteration", rows)
+
+    def _openpyxl_rows(self, path, sheet, min_row, max_row, max_col, columns, key):
+        wb = self.workbook(path)
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        rows = ws.iter_rows(min_row=min_row, max_row=max_row, max_col=max_col, values_only=True)
+        for row_num, values in enumerate(rows, min_row):
+            if not any(v is not None for v in values):
+                continue  # match the XML readers, which never see absent rows
+            if max_col is not None and len(values) < max_col:
+                values += (None,) * (max_col - len(values))
+            if key is not None:
+                key_col, accept = key
+                if not accept(values[key_col] if key_col < len(values) else None):
+                    continue
+            if columns is not None:
+                values = tuple(v if i in columns else None for i, v in enumerate(values))
+            yield row_num, values
+
+    def sheet_max_row(self, path, sheet):
+        """Last row of a sheet from its <dimension> ref (None if the part has none)."""
+        with self.archive(path).open(self.sheet_member(path, sheet)) as f:
+            for _, el in ET.iterparse(f, events=("start",)):
+                if el.tag == _DIMENSION_TAG:
+                    last = el.get("ref", "").rpartition(":")[2]
+                    digits = last.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+                    return int(digits) if digits.isdigit() else None
+                if el.tag == _SHEET_DATA_TAG:
+                    return None  # <dimension> always precedes <sheetData>
+        return None
+
+    def row_prefix_digest(self, path, sheet, row):
+        """
+        sha256 hex of a sheet's raw <sheetData> bytes before its first <row>
+        at or after row, without parsing them (see _RowSeek); None if the
+        sheet has no such row.
+        """
+        with self.archive(path).open(self.sheet_member(path, sheet)) as f:
+            seek = _RowSeek(f, row, digest=hashlib.sha256())
+        return seek.digest.hexdigest() if seek.found else None
+
+    def last_key_row(self, path, sheet, col):
+        """
+        Last row with a value in 0-based column col, found by regex over the
+        inflated worksheet bytes without parsing them.
+
+        The residual tail past the data (formula-only rows with no SKU) is
+        then never parsed, while data that resumes after a gap still lies
+        within the bound. Cells with no r= address can't be placed by the
+        regex, so if none is found the sheet's <dimension> ref is the bound
+        (None, read to the end, if it has none either).
+        """
+        # Only <c> carries a letter-prefixed r=; a trailing "/" is an empty cell
+        cell_re = re.compile(rb'r="' + col_letter(col).encode() + rb'(\d+)"[^>]*(?<!/)>')
+        last = None
+        tail = b""
+        with self.archive(path).open(self.sheet_member(path, sheet)) as f:
+            while True:
+                block = f.read(_SEEK_BLOCK)
+                if not block:
+                    break
+                buf = tail + block
+                for m in cell_re.finditer(buf):
+                    last = max(last or 0, int(m.group(1)))
+                tail = buf[-256:]  # a tag split across blocks matches next time
+        return last if last is not None else self.sheet_max_row(path, sheet)
+
+    def invalidate(self, path):
+        """Drop everything cached for path (the workbook changed on disk)."""
+        wb = self._workbooks.pop(path, None)
+        if wb is not None:
+            wb.close()
+        z = self._archives.pop(path, None)
+        if z is not None:
+            z.close()
+        self._shared_strings.pop(path, None)
+        self._sheet_parts.pop(path, None)
+        for key in [key for key in self._layouts if key[0] == path]:
+            del self._layouts[key]
+
+    def close(self):
+        for wb in self._workbooks.values():
+            wb.close()
+        for z in self._archives.values():
+            z.close()
+        self._workbooks.clear()
+        self._archives.clear()
+        self._shared_strings.clear()
+        self._sheet_parts.clear()
+        self._layouts.clear()
+
+
+# ── Raw-XML readers ──────────────────────────────────────────────────────────
+#
+# The streaming readers use iterparse and clear each <si>/<row> as soon as it
+# is decoded, so peak memory stays flat as the sheet grows. The *_dom variants
+# are the original whole-tree ET.parse implementation, kept for comparison.
+
+_SST_PATH = "xl/sharedStrings.xml"
+_WORKBOOK_PATH = "xl/workbook.xml"
+_WORKBOOK_RELS_PATH = "xl/_rels/workbook.xml.rels"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_SHEET_TAG = f"{{{WorkbookSession.NS}}}sheet"
+_REL_TAG = f"{{{_PKG_REL_NS}}}Relationship"
+_SI_TAG = f"{{{WorkbookSession.NS}}}si"
+_T_TAG = f"{{{WorkbookSession.NS}}}t"
+_IS_TAG = f"{{{WorkbookSession.NS}}}is"
+_ROW_TAG = f"{{{WorkbookSession.NS}}}row"
+_C_TAG = f"{{{WorkbookSession.NS}}}c"
+_V_TAG = f"{{{WorkbookSession.NS}}}v"
+_DIMENSION_TAG = f"{{{WorkbookSession.NS}}}dimension"
+_SHEET_DATA_TAG = f"{{{WorkbookSession.NS}}}sheetData"
+
+_COL_INDEXES = {}  # column letters -> 0-based index
+
+
+def col_index(ref):
+    """Extract column letter(s) from cell reference like 'A5' and return 0-based index."""
+    letters = ref.rstrip("0123456789")
+    idx = _COL_INDEXES.get(letters)
+    if idx is None:
+        idx = 0
+        for ch in letters:
+            idx = idx * 26 + (ord(ch) - ord("A") + 1)
+        idx = _COL_INDEXES[letters] = idx - 1  # 0-based
+    return idx
+
+
+def col_letter(idx):
+    """Inverse of col_index: 0-based index → column letters (29 → 'AD')."""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _read_sheet_parts(z):
+    """
+    Map sheet names to worksheet parts via xl/workbook.xml and its .rels.
+
+    Relationship targets are usually relative to xl/ ("worksheets/sheet1.xml")
+    but may be package-absolute ("/xl/worksheets/sheet1.xml").
+    """
+    with z.open(_WORKBOOK_RELS_PATH) as f:
+        targets = {
+            rel.get("Id"): rel.get("Target")
+            for rel in ET.parse(f).getroot().iter(_REL_TAG)
+        }
+    with z.open(_WORKBOOK_PATH) as f:
+        sheets = ET.parse(f).getroot().iter(_SHEET_TAG)
+        parts = []
+        for sheet in sheets:
+            target = targets[sheet.get(f"{{{_REL_NS}}}id")]
+            if target.startswith("/"):
+                member = target.lstrip("/")
+            else:
+                member = posixpath.normpath(posixpath.join("xl", target))
+            parts.append((sheet.get("name"), member))
+    return parts
+
+
+def _si_text(si):
+    """Join the text runs of a shared-string <si> (rich text has several <t>)."""
+    texts = []
+    for t_el in si.iter(_T_TAG):
+        if t_el.text:
+            texts.append(t_el.text)
+    return "".join(texts)
+
+
+def _cell_value(c_el, strings, typed):
+    """Decode one <c>: shared/inline strings, then numbers, booleans, errors."""
+    t = c_el.get("t")
+    if t == "inlineStr":
+        is_el = c_el.find(_IS_TAG)
+        return _si_text(is_el) if is_el is not None else None
+    v_el = c_el.find(_V_TAG)
+    if v_el is None or v_el.text is None:
+        return None
+    text = v_el.text
+    if t == "s":
+        return strings[int(text)]
+    if not typed or t in ("str", "e", "d"):
+        return text
+    if t == "b":
+        return text == "1"
+    # Plain number — cast like openpyxl: int unless it has a fraction/exponent
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _row_values(xml_row, strings, max_col, typed, columns=None, key=None):
+    """
+    Decode the <c> children of a <row> into a tuple indexed by 0-based column.
+
+    columns limits decoding to a projection; key=(col, accept) is checked on
+    that cell before anything else is decoded, returning None on rejection.
+    """
+    if columns is None and key is None:
+        values = [None] * max_col if max_col is not None else []
+        col = -1
+        for c_el in xml_row:
+            if c_el.tag != _C_TAG:
+                continue
+            ref = c_el.get("r")
+            col = col_index(ref) if ref else col + 1
+            if max_col is not None:
+                if col >= max_col:
+                    break  # cells are stored in column order
+            elif col >= len(values):
+                values.extend([None] * (col + 1 - len(values)))
+            values[col] = _cell_value(c_el, strings, typed)
+        return tuple(values)
+
+    # Locate cells first (cheap: attribute reads only), then decode selectively
+    cells = []
+    col = -1
+    for c_el in xml_row:
+        if c_el.tag != _C_TAG:
+            continue
+        ref = c_el.get("r")
+        col = col_index(ref) if ref else col + 1
+        if max_col is not None and col >= max_col:
+            break
+        if columns is None or col in columns or (key is not None and col == key[0]):
+            cells.append((col, c_el))
+
+    key_col = key_value = None
+    if key is not None:
+        key_col, accept = key
+        for col, c_el in cells:
+            if col == key_col:
+                key_value = _cell_value(c_el, strings, typed)
+                break
+        if not accept(key_value):
+            return None
+
+    width = max_col if max_col is not None else (cells[-1][0] + 1 if cells else 0)
+    values = [None] * width
+    for col, c_el in cells:
+        if col == key_col:
+            values[col] = key_value
+        elif columns is None or col in columns:
+            values[col] = _cell_value(c_el, strings, typed)
+    return tuple(values)
+
+
+def _read_shared_strings(z):
+    """Stream xl/sharedStrings.xml into a list, clearing each <si> once decoded."""
+    if _SST_PATH not in z.namelist():
+        return []
+    strings = []
+    with z.open(_SST_PATH) as f:
+        for _, el in ET.iterparse(f, events=("end",)):
+            if el.tag == _SI_TAG:
+                strings.append(_si_text(el))
+                el.clear()
+    return strings
+
+
+def _read_shared_strings_dom(z):
+    """Decode xl/sharedStrings.xml with a whole-tree parse."""
+    if _SST_PATH not in z.namelist():
+        return []
+    with z.open(_SST_PATH) as f:
+        root = ET.parse(f).getroot()
+    return [_si_text(si) for si in root.iter(_SI_TAG)]
+
+
+# Raw-byte patterns for _RowSeek: the opening <sheetData> tag and each <row>
+# start tag with its attributes (a prefix such as <x:row> is allowed).
+_SHEET_DATA_OPEN_RE = re.compile(rb"<(?:[\w.-]+:)?sheetData\b[^>]*>")
+_ROW_OPEN_RE = re.compile(rb"<(?:[\w.-]+:)?row(?=[\s>/])([^>]*)>")
+_ROW_R_RE = re.compile(rb'\br="(\d+)"')
+_SEEK_BLOCK = 1 << 20
+
+
+class _RowSeek:
+    """
+    File-like view of a worksheet part that starts at the first <row> at or
+    after min_row.
+
+    The rows before it are decompressed and their start tags matched with a
+    regex, but never reach the XML parser: read() returns the part header up
+    to <sheetData> (it declares the namespaces), then the bytes from that row
+    on. row_num is the number of the last row skipped, for rows without r=.
+    A --jobs chunk deep in TableX pays for inflating its prefix, not for
+    parsing it.
+
+    Pass a hashlib object as digest to have the skipped <sheetData> bytes fed
+    to it; found says whether a row at or after min_row was reached.
+    """
+
+    def __init__(self, f, min_row, digest=None):
+        self._f = f
+        self.row_num = 0
+        self.found = False
+        self.digest = digest
+        self._pending = self._seek(min_row)
+
+    def _skip(self, data):
+        if self.digest is not None:
+            self.digest.update(data)
+
+    def _seek(self, min_row):
+        buf = header = b""
+        scan = 0  # row tags before this offset in buf were already counted
+        before_last = 0
+        while True:
+            block = self._f.read(_SEEK_BLOCK)
+            buf += block
+            if not header:
+                m = _SHEET_DATA_OPEN_RE.search(buf)
+                if m is None:
+                    if not block:
+                        return buf
+                    continue
+                header, buf = buf[:m.end()], buf[m.end():]
+                if header.endswith(b"/>"):
+                    return header + buf  # empty <sheetData/>
+            last = None
+            for m in _ROW_OPEN_RE.finditer(buf, scan):
+                r = _ROW_R_RE.search(m.group(1))
+                row_num = int(r.group(1)) if r else self.row_num + 1
+                if row_num >= min_row:
+                    self.found = True
+                    self._skip(buf[:m.start()])
+                    return header + buf[m.start():]
+                before_last, self.row_num = self.row_num, row_num
+                last = m
+            if not block:
+                # Nothing at or after min_row: hand back the last (skipped)
+                # row so the closing tags still have something to close
+                self.row_num = before_last
+                return header + buf
+            if last is not None:
+                self._skip(buf[:last.start()])
+                buf, scan = buf[last.start():], last.end() - last.start()
+            elif scan == 0:
+                if b"sheetData>" in buf:
+                    return header + buf  # no rows at all
+                self._skip(buf[:-256])
+                buf = buf[-256:]  # only whitespace so far, and maybe a split tag
+
+    def read(self, size=-1):
+        if self._pending:
+            data, self._pending = self._pending, b""
+            return data
+        return self._f.read(size)
+
+
+def _iter_sheet_rows(z, member, strings, min_row=1, max_row=None, max_col=None, typed=True,
+                     columns=None, key=None):
+    """
+    Stream a worksheet part, yielding (row_num, values) as each <row> closes.
+
+    Finished rows are cleared and detached from <sheetData>, so the partial
+    tree never holds more than the row being decoded. Rows before min_row are
+    skipped at the byte level (see _RowSeek) and never parsed; parsing stops
+    after max_row.
+    """
+    with z.open(member) as f:
+        parent = last_start = None
+        row_num = 0
+        if min_row > 1:
+            f = _RowSeek(f, min_row)
+            row_num = f.row_num
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if parent is None and el.tag == _ROW_TAG:
+                    parent = last_start  # <sheetData>
+                last_start = el
+                continue
+            if el.tag == _ROW_TAG:
+                row_num = int(el.get("r") or row_num + 1)
+                if max_row is not None and row_num > max_row:
+                    return
+                values = None
+                if row_num >= min_row:
+                    values = _row_values(el, strings, max_col, typed, columns, key)
+                el.clear()
+                parent.remove(el)
+                if values is not None:
+                    yield row_num, values
+
+
+def _iter_sheet_rows_dom(z, member, strings, min_row=1, max_row=None, max_col=None, typed=True,
+                         columns=None, key=None):
+    """Parse a whole worksheet part, then yield (row_num, values) for each <row>."""
+    with z.open(member) as f:
+        root = ET.parse(f).getroot()
+    row_num = 0
+    for xml_row in root.iter(_ROW_TAG):
+        row_num = int(xml_row.get("r") or row_num + 1)
+        if max_row is not None and row_num > max_row:
+            return
+        if row_num < min_row:
+            continue
+        values = _row_values(xml_row, strings, max_col, typed, columns, key)
+        if values is not None:
+            yield row_num, values
+
+
+def safe_float(val, default=None):
+    """Convert a value to float, returning default if not possible."""
+    if val is None:
+        return default
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return default
+
+
+def safe_str(val):
+    """Convert a value to string, returning empty string for None."""
+    if val is None:
+        return ""
+    return str(val).strip()
+
+
+def safe_date(val):
+    """
+    YYYY-MM-DD for a date cell, or None. The XML readers give Excel serials
+    as numbers, openpyxl gives datetimes, and typed-in dates stay strings.
+    """
+    if isinstance(val, datetime):
+        return val.date().isoformat()
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return (EXCEL_EPOCH + timedelta(days=int(val))).date().isoformat() if val > 0 else None
+    text = safe_str(val)
+    try:
+        return datetime.fromisoformat(text).date().isoformat()
+    except ValueError:
+        pass
+    for fmt in ("%m/%d/%Y", "%m/%d/%y"):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+# ── Sheet schemas ────────────────────────────────────────────────────────────
+#
+# scripts/sheet-schemas.json declares each sheet's layout: sheet, header rows,
+# row bounds, field → column letter (+ header label) with a type, and the
+# filter rules for its key column. WorkbookSession.layout() resolves a schema
+# against the actual header row once per sheet, so parsers index the row
+# tuple by precomputed column numbers instead of hard-coded ones.
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheet-schemas.json")
+
+COERCIONS = {"str": safe_str, "float": safe_float, "date": safe_date}
+
+SheetLayout = namedtuple("SheetLayout", "sheet names mapped index columns max_col header_row first_row record")
+
+
+def load_sheet_schemas(path=SCHEMA_PATH):
+    """Load {extractor name: sheet schema} from sheet-schemas.json."""
+    with open(path) as f:
+        return json.load(f)["sheets"]
+
+
+_sheet_schemas = None  # loaded on first use; configure_paths(schema=...) resets it
+
+
+def sheet_schemas():
+    """The schemas from SCHEMA_PATH, read once."""
+    global _sheet_schemas
+    if _sheet_schemas is None:
+        _sheet_schemas = load_sheet_schemas(SCHEMA_PATH)
+    return _sheet_schemas
+
+
+@lru_cache(maxsize=None)
+def record_type(names):
+    """The namedtuple class parsers yield for a layout's field names (one per distinct layout)."""
+    return namedtuple("Record", names)
+
+
+def _header_key(value):
+    """Normalize a header cell for matching: collapse whitespace, ignore case."""
+    return " ".join(str(value).split()).casefold()
+
+
+def _expand_fields(fields):
+    """Schema fields with derived: discountTiers expanded to the price_* fields."""
+    for field in fields:
+        if field.get("derived") == "discountTiers":
+            for name, _ in discount_tiers():
+                yield {"name": name, "derived": "discountTiers"}
+        else:
+            yield field
+
+
+def _detect_header(session, path, schema):
+    """
+    Pick the header row among schema["headerRows"]: the one where the most
+    declared header labels appear. Returns (row_num, {label key: column}) with
+    labels that occur more than once in that row left out; (None, {}) if none match.
+    """
+    labels = {_header_key(f["header"]) for f in schema["fields"] if f.get("header")}
+    header_rows = schema.get("headerRows") or []
+    if not labels or not header_rows:
+        return None, {}
+    best_row, best, best_hits = None, {}, 0
+    rows = session.rows(path, schema["sheet"], min_row=min(header_rows), max_row=max(header_rows), typed=False)
+    for row_num, values in rows:
+        if row_num not in header_rows:
+            continue
+        found, repeated = {}, set()
+        for col, value in enumerate(values):
+            if value is None:
+                continue
+            key = _header_key(value)
+            if key in found:
+                repeated.add(key)
+            found[key] = col
+        hits = len(labels & (found.keys() - repeated))
+        if hits > best_hits:
+            best_row, best_hits = row_num, hits
+            best = {key: col for key, col in found.items() if key in labels and key not in repeated}
+    return best_row, best
+
+
+def resolve_layout(session, path, schema):
+    """
+    Resolve a sheet schema to a SheetLayout: record field order (names), the
+    (name, column, coerce) triples read from the row (mapped), name → column
+    (index), the projection and max_col for WorkbookSession.rows(), the
+    detected header row, and the record_type() parsers yield. A header label
+    found in the header row overrides the declared letter, with a note, so
+    inserted columns are followed.
+    """
+    header_row, headers = _detect_header(session, path, schema)
+    names, mapped, index = [], [], {}
+    for field in _expand_fields(schema["fields"]):
+        name = field["name"]
+        names.append(name)
+        if field.get("derived"):
+            continue
+        col = col_index(field["column"])
+        found = headers.get(_header_key(field["header"])) if field.get("header") else None
+        if found is not None and found != col:
+            print(f"  schema: {schema['sheet']}.{name} found under {field['header']!r} "
+                  f"in column {col_letter(found)}, not {field['column']}")
+            col = found
+        mapped.append((name, col, COERCIONS[field.get("type", "str")]))
+        index[name] = col
+    columns = frozenset(index.values())
+    first_row = schema.get("firstRow", 1)
+    if header_row is not None:
+        first_row = max(first_row, header_row + 1)
+    return SheetLayout(
+        schema["sheet"], tuple(names), tuple(mapped), index, columns,
+        max(columns) + 1, header_row, first_row, record_type(tuple(names)),
+    )
+
+
+def build_record(layout, vals):
+    """
+    Working record dict in schema field order; derived fields start as None.
+    Parsers fill it in, then yield layout.record._make(record.values()).
+    """
+    record = dict.fromkeys(layout.names)
+    for name, col, coerce in layout.mapped:
+        record[name] = coerce(vals[col])
+    return record
+
+
+def key_filter(extractor, layout, schema):
+    """
+    key=(column, accept) for WorkbookSession.rows() built from the schema's
+    filters; a rejected row is counted under its rule's name.
+    """
+    coerce = COERCIONS[next(f.get("type", "str") for f in schema["fields"] if f.get("name") == schema["key"])]
+    tests = []
+    for rule in schema.get("filters", []):
+        test = rule["test"]
+        if test == "nonEmpty":
+            check = bool
+        elif test == "hasDigit":
+            check = lambda v: any(ch.isdigit() for ch in v)
+        elif test == "minLength":
+            check = lambda v, n=rule["value"]: len(v) >= n
+        elif test == "excludes":
+            prefixes = tuple(rule.get("prefixes", ()))
+            contains = [part.lower() for part in rule.get("contains", ())]
+            check = lambda v, p=prefixes, c=contains: not (
+                v.startswith(p) or any(part in v.lower() for part in c)
+            )
+        else:
+            raise ValueError(f"Unknown filter test {test!r} in {schema['sheet']} schema")
+        tests.append((rule["rule"], check))
+
+    def accept(value):
+        value = coerce(value)
+        for rule, check in tests:
+            if not check(value):
+                PROFILER.skip(extractor, rule)
+                return False
+        return True
+
+    return layout.index[schema["key"]], accept
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SKU DECODER — shared by the ProfitAnalysis and TableX parsers
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+SHAPE_CODES = {
+    "TC": "Rectangular",
+    "SQ": "Square",
+    "RD": "Round",
+    "SC": "Semicircle",
+    "CS": "C-Shape",
+    "HR": "Horse Race",
+    "RT": "Racetrack",
+    "OV": "Oval",
+    "KD": "Kidney",
+    "TR": "Trapezoid",
+    "PW": "Power",
+}
+
+# Option suffix codes (mirrors optionSuffixes in src/data/sku-registry.ts)
+OPTION_CODES = {
+    "LC": "Locking Casters",
+    "NE": "Nesting",
+    "FD": "Folding",
+    "CH": "Chrome",
+    "GM": "Grommet",
+    "MV": "Modesty Panel",
+    "KB": "Keyboard Tray",
+    "PM": "Power Module",
+    "GL": "Glides",
+    "AG": "Anti-Glare",
+    "MATCH": "Match Finish",
+    "PRE": "Pre-wired",
+    "SOLID": "Solid Surface",
+    "BB": "Bar Base",
+    "SELF": "Self Edge",
+    "TJ": "T-Joint",
+    "RC": "Radius Corner",
+    "RA": "Right Angle",
+    "ASB": "Assembly",
+    "QG": "Quick Glide",
+    "WMCT": "Cable Tray",
+    "GFLIP": "Flip Top",
+    "OS": "Oversize",
+}
+
+SKU_CACHE_SIZE = 16384  # distinct SKUs across both Quote Table sheets fit comfortably
+
+_SERIES_RE = re.compile(r"(?:SP-)?(\d{2})")
+_SKU_CORE_RE = re.compile(r"(\d{2})([A-Z]{2})(\d{4,})")
+_BASE_RE = re.compile(r"([A-Z]+\d*)")
+_PAREN_GROUP_RE = re.compile(r"\([^()]*\)")
+_POST_CONFIG_RE = re.compile(r"^(\d)[PKW]$")
+_SPECIAL_HEIGHT_RE = re.compile(r"SH\.(\d+(?:\.\d+)?)")
+_GROMMET_RE = re.compile(r"GR\.([A-Z0-9]+)")
+
+SkuParts = namedtuple(
+    "SkuParts",
+    "series isSpecial shape shapeName size baseType postConfig specialHeight grommet options",
+)
+
+
+@lru_cache(maxsize=SKU_CACHE_SIZE)
+def decode_sku(sku):
+    """
+    Parse a TableX SKU into components.
+    Example: 99SQ3030QD16-3P → series=99, shape=SQ, size=3030, base=QD16, posts=3P
+    Patterns:
+      - Optional SP- prefix (special)
+      - 2-digit series
+      - 2-letter shape code (TC, SQ, RD, SC, CS, HR, RT, etc.)
+      - 4-digit size (W x D in inches, e.g. 3048 = 30x48)
+      - Base code (T, U, X, QD, D + size)
+      - Suffixes: -3P, -LC, -SH.XX, -NE, -FD, -CH, -GR.A, -PRE, -OS, etc.
+
+    Suffixes decode to postConfig (3P → 3), specialHeight (SH.28.5 → "28.5"),
+    grommet (GR.A → "A") and options (every other suffix code, e.g. ["LC", "NE"]).
+    Parenthesised part numbers are dropped before splitting on "-", so
+    99RD24X22BLS-3P-PRE(7999K-12)-LC → posts=3, options=["PRE", "LC"].
+    Results are memoized; SKUs repeat heavily across the two sheets.
+    """
+    series_match = _SERIES_RE.match(sku)
+    series = series_match.group(1) if series_match else ""
+
+    is_special = sku.startswith("SP-")
+    clean = sku[3:] if is_special else sku
+    shape = shape_name = size = base_type = ""
+
+    # Match: series (2 digits) + shape (2 letters) + size (4+ digits)
+    m = _SKU_CORE_RE.match(clean)
+    if m:
+        shape = m.group(2)
+        shape_name = SHAPE_CODES.get(shape, shape)
+
+        # Parse size: first 2 digits x next 2 digits (e.g., 3048 → 30"x48")
+        size_str = m.group(3)
+        size = f'{size_str[:2]}"x{size_str[2:4]}"'
+
+        # Base type follows size
+        base_match = _BASE_RE.match(clean, m.end())
+        if base_match:
+            base_type = base_match.group(1)
+
+    # Suffixes are the hyphen-separated parts after the main code
+    post_config = None
+    special_height = ""
+    grommet = ""
+    options = []
+    for part in _PAREN_GROUP_RE.sub("", clean).split("-")[1:]:  # PRE(8215K-12) → PRE
+        if not part:
+            continue
+        post_match = _POST_CONFIG_RE.match(part)
+        if post_match:
+            post_config = int(post_match.group(1))
+            continue
+        height_match = _SPECIAL_HEIGHT_RE.match(part)
+        if height_match:
+            special_height = height_match.group(1)
+            continue
+        grommet_match = _GROMMET_RE.match(part)
+        if grommet_match:
+            grommet = grommet_match.group(1)
+            continue
+        options.append("ASB" if part.startswith("ASB") else part)
+
+    return SkuParts(
+        series, is_special, shape, shape_name, size, base_type,
+        post_config, special_height, grommet, tuple(options),
+    )
+
+
+def decode_many(skus):
+    """
+    Decode a batch of SKUs into columnar form: {field: [value per SKU]}.
+
+    Shares decode_sku's memo, so repeated SKUs cost a dict lookup.
+    """
+    decoded = [decode_sku(sku) for sku in skus]
+    return {
+        field: [parts[i] for parts in decoded]
+        for i, field in enumerate(SkuParts._fields)
+    }
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# DISCOUNT-TIER PRICING — list price column → price_50_20 … columns
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+DISCOUNT_TIERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "discount-tiers.json")
+
+# Used when discount-tiers.json is absent: 50/20 plus 5/10/15/20 cascades
+DEFAULT_DISCOUNT_TIERS = [[50, 20], [50, 20, 5], [50, 20, 10], [50, 20, 15], [50, 20, 20]]
+
+
+def load_discount_tiers(path=DISCOUNT_TIERS_PATH):
+    """
+    Load the tier table as [(field, multiplier), ...] in output column order.
+
+    Cascading: 50/20 = list * 0.50 * 0.80 = 0.40, 50/20/5 = 0.40 * 0.95 = 0.38, …
+    The multiplier is rounded to 10 places so it is the same float as the
+    literal (0.38, not 0.37999999999999995) and rounding matches the old
+    round(list_price * 0.38, 2) exactly.
+    """
+    tiers = DEFAULT_DISCOUNT_TIERS
+    if os.path.exists(path):
+        with open(path) as f:
+            tiers = [tier["discounts"] for tier in json.load(f)["tiers"]]
+
+    table = []
+    for discounts in tiers:
+        multiplier = 1.0
+        for pct in discounts:
+            multiplier *= 1 - pct / 100
+        field = "price_" + "_".join(f"{pct:g}" for pct in discounts)
+        table.append((field, round(multiplier, 10)))
+    return table
+
+
+@lru_cache(maxsize=None)
+def discount_tiers():
+    """The tier table from discount-tiers.json, read on first use."""
+    return load_discount_tiers()
+
+
+def price_tiers(list_prices, tiers=None):
+    """
+    Apply every discount tier to a column of list prices in one batch.
+
+    Returns {field: [price per row]}; rows with no list price (None or 0)
+    get None in every tier column. Pass a different tier table for
+    what-if repricing (default: discount_tiers()).
+    """
+    if tiers is None:
+        tiers = discount_tiers()
+    return {
+        field: [round(lp * multiplier, 2) if lp else None for lp in list_prices]
+        for field, multiplier in tiers
+    }
+
+
+def fill_price_tiers(records, list_prices, tiers=None):
+    """Write the price_tiers() columns into records, which already hold placeholder keys."""
+    for field, column in price_tiers(list_prices, tiers).items():
+        for record, price in zip(records, column):
+            record[field] = price
+
+
+# Streaming parsers price this many rows per batch before yielding them
+PRICE_BATCH_SIZE = 2048
+
+
+def priced_batches(rows, record):
+    """
+    Yield record tuples from (record dict, list_price) pairs with tier prices filled in.
+
+    Rows are buffered PRICE_BATCH_SIZE at a time so pricing stays a column
+    operation while the parser still streams with bounded memory. Each
+    finished dict becomes a `record` namedtuple (its keys are record's fields).
+    """
+    batch, list_prices = [], []
+    for row, list_price in rows:
+        batch.append(row)
+        list_prices.append(list_price)
+        if len(batch) >= PRICE_BATCH_SIZE:
+            with PROFILER.stage("tier pricing"):
+                fill_price_tiers(batch, list_prices)
+            yield from (record._make(row.values()) for row in batch)
+            batch, list_prices = [], []
+    if batch:
+        with PROFILER.stage("tier pricing"):
+            fill_price_tiers(batch, list_prices)
+        yield from (record._make(row.values()) for row in batch)
+
+
+def _key_max_row(session, layout, schema):
+    """
+    Where a Quote Table scan can stop: the schema's maxRow if set, else the
+    last row with a value in the key column (WorkbookSession.last_key_row).
+    """
+    if schema.get("maxRow") is not None:
+        return schema["maxRow"]
+    with PROFILER.stage("key scan"):
+        return session.last_key_row(QUOTE_TABLE_PATH, layout.sheet, layout.index[schema["key"]])
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. PROFIT ANALYSIS — from Quote Table "ProfitAnalysis" sheet
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def extract_profit_analysis(session):
+    """
+    ProfitAnalysis sheet column mapping (from row 1 headers):
+      A: Tag/label    B: Qty           C: Product (SKU)
+      D: Top cost     E: Route cost    F: Bases cost
+      G: NE/FD/FT     H: ASB/GN/LC     I: ASB/GN/LC (2nd)
+      J: Smith/Valley (subtotal)       K: LF
+      L: (unlabeled)  M: Frt In        N: PKG
+      O: Total Cost   P: Frt Out %     Q: (cost + frt out, calculated)
+      R: GPM          S: Comm.         T: Standard (selling price)
+      U: Net Profit   V: List Price    W: Disc.
+      X: Net Price    Y: new net profit Z: Notes
+
+    Valid data rows have a SKU in column C (alphanumeric pattern with digits).
+    Rows 681+ are formula residuals (no SKU, just PKG=15). The scan stops at
+    the last row with anything in the SKU column (_key_max_row), so the tail
+    is never parsed but a gap of SKU-less rows mid-sheet cannot cut it short;
+    inside that bound the SKU is checked before the rest of the row is decoded.
+
+    Yields layout.record namedtuples as rows are decoded (tier prices filled per batch).
+    """
+    layout = session.layout(QUOTE_TABLE_PATH, sheet_schemas()["profit"])
+    return priced_batches(_profit_analysis_rows(session, layout), layout.record)
+
+
+def _profit_analysis_rows(session, layout):
+    schema = sheet_schemas()["profit"]
+    rows = session.rows(
+        QUOTE_TABLE_PATH, layout.sheet, min_row=layout.first_row,
+        max_row=_key_max_row(session, layout, schema),
+        max_col=layout.max_col, columns=layout.columns,
+        key=key_filter("profit", layout, schema),
+    )
+    for _, vals in rows:
+        with PROFILER.stage("cell decode"):
+            record = build_record(layout, vals)  # sku already passed the schema filters
+
+            # Extract series code from SKU: first 2 digits (or "SP-XX" prefix)
+            with PROFILER.stage("sku decode"):
+                record["series"] = decode_sku(record["sku"]).series
+
+            # Tier prices come from list price; discountFactor is col W
+            # (0.68 = 50/20/20, 0.66, 0.64, 0.62, 0.60 = 50/20)
+            list_price = record["listPrice"]
+            if list_price is None:
+                list_price = 0
+        yield record, list_price
+
+
+def parse_profit_analysis(session):
+    """Extract and write profit-analysis.json; returns the record count."""
+    print("\n[1/10] Parsing ProfitAnalysis sheet...")
+    return write_json(extract_profit_analysis(session), "profit-analysis.json")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 2. PRODUCT CATALOG — from Quote Table "TableX" sheet
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def extract_product_catalog(session, min_row=None, max_row=None):
+    """
+    TableX sheet column mapping (from row 1 headers):
+      A: DATE         B: (label/notes) C: Qty
+      D: Product (SKU)                 E: Top cost
+      F: Route cost   G: Bases per table
+      H: NE/FD/FT     I: ASB/GN/LC     J: ASB/GN/LC (2nd)
+      K: Smith/Valley  L: LF            M: Edge
+      N: Frt In        O: PKG           P: Total Cost
+      Q: Frt Out %     R: (cost+frt)    S: GPM
+      T: Comm.         U: Standard      V: Net Profit
+      W: List Price    X: Disc.         Y: Net Price
+      Z: new net profit
+      AA: SKID 96"
+      AD: Notes
+
+    Valid rows: column D contains a SKU-like string (alphanumeric with digits, len > 5).
+    Rows after ~6100 are formula residuals with no SKU; the scan stops at the
+    last row with anything in column D, as in extract_profit_analysis.
+
+    min_row/max_row bound the scan so --jobs can split the sheet into chunks
+    (default: the schema's firstRow to its maxRow or _key_max_row).
+    Yields layout.record namedtuples as rows are decoded (tier prices filled per batch).
+    """
+    layout = session.layout(QUOTE_TABLE_PATH, sheet_schemas()["catalog"])
+    return priced_batches(_product_catalog_rows(session, layout, min_row, max_row), layout.record)
+
+
+def _product_catalog_rows(session, layout, min_row=None, max_row=None):
+    schema = sheet_schemas()["catalog"]
+    rows = session.rows(
+        QUOTE_TABLE_PATH, layout.sheet,
+        min_row=layout.first_row if min_row is None else max(min_row, layout.first_row),
+        max_row=_key_max_row(session, layout, schema) if max_row is None else max_row,
+        max_col=layout.max_col, columns=layout.columns,
+        key=key_filter("catalog", layout, schema),
+    )
+    for _, vals in rows:
+        with PROFILER.stage("cell decode"):
+            record = build_record(layout, vals)  # sku already passed the schema filters
+
+            # Decode SKU components
+            with PROFILER.stage("sku decode"):
+                sku_parts = decode_sku(record["sku"])
+            record["series"] = sku_parts.series
+            record["shape"] = sku_parts.shape
+            record["shapeName"] = sku_parts.shapeName
+            record["size"] = sku_parts.size
+            record["baseType"] = sku_parts.baseType
+            record["isSpecial"] = sku_parts.isSpecial
+            record["postConfig"] = sku_parts.postConfig
+            record["specialHeight"] = sku_parts.specialHeight
+            record["grommet"] = sku_parts.grommet
+            record["options"] = list(sku_parts.options)
+
+            list_price = record["listPrice"]  # W = List Price
+            if list_price is None:
+                list_price = 0
+        yield record, list_price
+
+
+def parse_product_catalog(session):
+    """Extract and write product-catalog.json; returns the record count."""
+    print("\n[2/10] Parsing TableX product catalog sheet...")
+    count = write_json(extract_product_catalog(session), "product-catalog.json")
+    info = decode_sku.cache_info()
+    print(f"  SKU decoder: {info.misses:,} decoded, {info.hits:,} cache hits")
+    return count
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. QUOTE QUEUE — parsed via raw XML to bypass stylesheet bug
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# ── Date normalization ───────────────────────────────────────────────────────
+#
+# Queue date cells are typed by hand ("Feb 10 / 8:48pm", "Mar 8 / 12 PM") or
+# are Excel serials ("45037"). parse_date() decodes one cell into DateParts;
+# results are memoized, since statuses and receipt times repeat. Patterns are
+# compiled once and tried in hit-frequency order on the real queue (~96%
+# "Mon D / h:mm am", then serials, then "Mon D / h am").
+#
+# normalize_date() keeps the original "MM-DDTHH:MM" fragment (the dashboard
+# parses it); date_value()/date_iso() resolve the year for a full timestamp.
+# DATE_STATS counts which rule handled each call.
+
+MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+ROLLOVER_WINDOW = timedelta(days=183)
+DATE_CACHE_SIZE = 32768
+
+# "Feb 10 / 8:48pm", "July 11 / 10:04 AM" — \s* also covers the spaced form
+_DATE_HM_RE = re.compile(r"(\w{3,9})\s+(\d{1,2})\s*/\s*(\d{1,2}):(\d{2})\s*(am|pm|AM|PM)")
+# "Feb 10 / 8pm" (no minutes)
+_DATE_H_RE = re.compile(r"(\w{3,9})\s+(\d{1,2})\s*/\s*(\d{1,2})\s*(am|pm|AM|PM)")
+
+DateParts = namedtuple("DateParts", "rule year month day hour minute")
+
+DATE_RULES = ("hm", "serial", "h", "unparsed", "empty")
+DATE_STATS = dict.fromkeys(DATE_RULES, 0)
+
+
+def _clock_parts(rule, month_str, day_str, hour_str, min_str, ampm):
+    """DateParts from pattern groups; ValueError for an unknown month name."""
+    month = MONTHS.get(month_str.lower())
+    if month is None:
+        raise ValueError(f"Unknown month: {month_str}")
+    hour = int(hour_str)
+    ampm = ampm.lower()
+    if ampm == "pm" and hour != 12:
+        hour += 12
+    elif ampm == "am" and hour == 12:
+        hour = 0
+    return DateParts(rule, None, month, int(day_str), hour, int(min_str))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(raw):
+    """
+    Decode one queue date cell into DateParts.
+
+    rule names what matched: "hm", "h", "serial", "unparsed" (free text such
+    as "no quote") or "empty". year is only known for Excel serials; the typed
+    forms leave it None and date_iso() infers it from the queue section.
+    """
+    if not raw or not isinstance(raw, str):
+        return DateParts("empty", None, None, None, None, None)
+    raw = raw.strip()
+
+    m = _DATE_HM_RE.match(raw)
+    if m:
+        try:
+            return _clock_parts("hm", *m.groups())
+        except ValueError:
+            pass
+
+    # Excel serial date numbers (e.g., "45037" = days since 1899-12-30)
+    if raw.isdigit() and 40000 < int(raw) < 50000:
+        dt = EXCEL_EPOCH + timedelta(days=int(raw))
+        return DateParts("serial", dt.year, dt.month, dt.day, 0, 0)
+
+    m = _DATE_H_RE.match(raw)
+    if m:
+        g = m.groups()
+        try:
+            return _clock_parts("h", g[0], g[1], g[2], "00", g[3])
+        except ValueError:
+            pass
+
+    return DateParts("unparsed", None, None, None, None, None)
+
+
+def _parse_counted(raw):
+    parts = parse_date(raw)
+    DATE_STATS[parts.rule] += 1
+    return parts
+
+
+def normalize_date(raw):
+    """
+    Normalize dates like "Feb 10 / 8:48pm" to "MM-DDTHH:MM" (no year).
+    Returns the raw value unchanged if it doesn't parse.
+    """
+    parts = _parse_counted(raw)
+    if parts.month is None:
+        return raw.strip() if parts.rule == "unparsed" else raw
+    return f"{parts.month:02d}-{parts.day:02d}T{parts.hour:02d}:{parts.minute:02d}"
+
+
+def date_value(raw, year, after=None):
+    """
+    datetime for a queue date cell, or None.
+
+    year is the record's queue year; serials carry their own. after is the
+    receipt datetime when resolving a status: a status landing more than
+    half a year before it belongs to the next year (received Dec 28,
+    finished Jan 3). Impossible dates (Feb 30, 25:00) give None.
+    """
+    parts = parse_date(raw)
+    if parts.month is None or (year is None and parts.year is None):
+        return None
+    try:
+        dt = datetime(parts.year or year, parts.month, parts.day, parts.hour, parts.minute)
+        if parts.year is None and after is not None and dt < after - ROLLOVER_WINDOW:
+            dt = dt.replace(year=dt.year + 1)
+    except ValueError:
+        return None
+    return dt
+
+
+def date_iso(raw, year, after=None):
+    """date_value() as an ISO timestamp string ("2024-03-25T11:13:00"), or None."""
+    dt = date_value(raw, year, after)
+    return dt.isoformat() if dt else None
+
+
+def normalize_dates(values):
+    """Batch normalize_date(): one fragment (or raw value) per input."""
+    return [normalize_date(raw) for raw in values]
+
+
+def dates_iso(values, years):
+    """Batch date_iso() over parallel lists of raw cells and queue years."""
+    return [date_iso(raw, year) for raw, year in zip(values, years)]
+
+
+def date_stats():
+    """Per-rule call counts plus memo hit/miss counts, for logs and reports."""
+    info = parse_date.cache_info()
+    return {**DATE_STATS, "cacheHits": info.hits, "cacheMisses": info.misses}
+
+
+# ── Queue rows ───────────────────────────────────────────────────────────────
+
+QueueRecord = namedtuple(
+    "QueueRecord",
+    "rowNum emailFrom dateTime dateNormalized dateIso year quoteNumber dealerProject "
+    "special staff status statusNormalized statusIso",
+)
+
+_SECTION_YEAR_RE = re.compile(r"20(2[3-9])")
+_QUOTE_YEAR_RE = re.compile(r"^(2[3-9])\.")
+
+
+def iter_quote_queue(session, min_row=None, start_year=2023):
+    """
+    Parse Quote Queue via raw XML (zipfile) to bypass stylesheet issues.
+
+    Column mapping (from row 2 headers; see the queue entry in sheet-schemas.json —
+    the queue is the workbook's first sheet, it has never been looked up by name):
+      A: EMAIL FROM
+      B: DATE / TIME REC'D
+      C: QUOTE # / EMAIL QUOTE / SO #
+      D: DEALER / PROJECT NAME
+      E: SPECIAL?
+      F: MAF, SS, or MM?
+      G: STATUS / COMPLETED
+
+    Row 1 = title, Row 2 = headers, Rows 3-4 = section headers.
+    Data starts at row 5.
+    Some rows are section headers (e.g., "COMPLETED ALL 2023...").
+
+    Yields (QueueRecord, section_year) so delta mode can resume mid-sheet:
+    start at min_row (default: the schema's firstRow) with start_year set to
+    that row's section year.
+    """
+    # Track current year section for date inference
+    current_year = start_year
+
+    layout = session.layout(QUOTE_QUEUE_PATH, sheet_schemas()["queue"])
+    a_col, b_col, c_col, d_col, e_col, f_col, g_col = (
+        layout.index[name]
+        for name in ("emailFrom", "dateTime", "quoteNumber", "dealerProject", "special", "staff", "status")
+    )
+    rows = session.rows(
+        QUOTE_QUEUE_PATH, layout.sheet,
+        min_row=layout.first_row if min_row is None else min_row, max_col=layout.max_col,
+        columns=layout.columns, typed=False,
+    )
+    for row_num, cells in rows:
+        with PROFILER.stage("cell decode"):
+            if row_num <= 2:
+                PROFILER.skip("queue", "title/header row")
+                continue  # Skip title and header rows
+
+            a_val = safe_str(cells[a_col])  # A: Email From
+            b_val = safe_str(cells[b_col])  # B: Date/Time
+            c_val = safe_str(cells[c_col])  # C: Quote #
+            d_val = safe_str(cells[d_col])  # D: Dealer/Project
+            e_val = safe_str(cells[e_col])  # E: Special?
+            f_val = safe_str(cells[f_col])  # F: Staff
+            g_val = safe_str(cells[g_col])  # G: Status
+
+            # Skip section header rows (they span across merged cells with long descriptions)
+            if a_val and ("COMPLETED" in a_val.upper() or "QUEUE" in a_val.upper()):
+                # Try to extract year from section header
+                year_match = _SECTION_YEAR_RE.search(a_val)
+                if year_match:
+                    current_year = int("20" + year_match.group(1))
+                PROFILER.skip("queue", "section header")
+                continue
+
+            # Skip rows with no meaningful data (no email from AND no dealer)
+            if not a_val and not d_val:
+                PROFILER.skip("queue", "no sender or dealer")
+                continue
+
+            # Normalize Special? to boolean
+            special = None
+            if e_val:
+                e_upper = e_val.upper().strip()
+                if e_upper in ("YES", "Y"):
+                    special = True
+                elif e_upper in ("NO", "N", "-"):
+                    special = False
+
+            # Infer year from quote numbers where available
+            # Quote numbers like 23.MAF.xxx → year 2023, 24.xxx → 2024, etc.
+            year = current_year
+            year_from_qn = _QUOTE_YEAR_RE.match(c_val)
+            if year_from_qn:
+                year = 2000 + int(year_from_qn.group(1))
+
+            # Normalize dates: legacy MM-DD fragments plus full ISO timestamps
+            with PROFILER.stage("date normalization"):
+                date_normalized = normalize_date(b_val)
+                status_normalized = normalize_date(g_val)
+                received = date_value(b_val, year)
+                completed = date_value(g_val, year, after=received)
+
+            record = QueueRecord(
+                rowNum=row_num,
+                emailFrom=a_val,
+                dateTime=b_val,
+                dateNormalized=date_normalized,
+                dateIso=received.isoformat() if received else None,
+                year=year,
+                quoteNumber=c_val,
+                dealerProject=d_val,
+                special=special,
+                staff=f_val.strip(),
+                status=g_val,
+                statusNormalized=status_normalized,
+                statusIso=completed.isoformat() if completed else None,
+            )
+        yield record, current_year
+
+
+def extract_quote_queue(session):
+    """Yield every Quote Queue record (see iter_quote_queue)."""
+    return (record for record, _ in iter_quote_queue(session))
+
+
+def parse_quote_queue(session):
+    """Extract and write quote-queue.json; returns the record count."""
+    print("\n[3/10] Parsing Quote Queue via raw XML...")
+    count = _parse_quote_queue_full(session)
+    _print_date_stats()
+    return count
+
+
+def _print_date_stats():
+    stats = date_stats()
+    rules = ", ".join(f"{stats[rule]:,} {rule}" for rule in DATE_RULES if stats[rule])
+    print(f"  Date normalizer: {rules}; {stats['cacheHits']:,} cache hits")
+
+
+def _parse_quote_queue_full(session):
+    last = None
+
+    def records():
+        nonlocal last
+        for record, year in iter_quote_queue(session):
+            last = record, year
+            yield record
+
+    count = write_json(records(), "quote-queue.json")
+    save_queue_state(session, last, count)
+    return count
+
+
+# ── Quote Queue delta mode (--queue-delta) ───────────────────────────────────
+#
+# New quotes arrive at the bottom, but staff fill in status and dates on older
+# rows later. After each run we remember the last record's rowNum, its section
+# year and hash, a hash of the raw sheet XML before that row, and a hash of
+# the shared strings it could refer to. The next delta run re-hashes that
+# prefix without parsing it (_RowSeek), then decodes only from the last
+# record on: it must come out unchanged, and the rows after it are appended
+# to quote-queue.json, skipping the full re-serialization. If any earlier row
+# changed (edited, deleted, even restyled) or quote-queue.json no longer
+# matches the state, it falls back to a full parse.
+
+QUEUE_STATE_PATH = os.path.join(OUT_DIR, ".quote-queue-state.json")
+QUEUE_DELTA_FILE = "quote-queue.delta.json"
+
+
+def _record_digest(record):
+    return hashlib.sha256(json.dumps(record._asdict(), sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _strings_digest(strings, count):
+    """Hash of the first count shared strings; None if there are fewer now."""
+    if len(strings) < count:
+        return None
+    return hashlib.sha256("\0".join(strings[:count]).encode()).hexdigest()
+
+
+def save_queue_state(session, last, count):
+    """Record the delta-mode state for the last (record, section year) written."""
+    record, year = last or (None, None)
+    strings = session.shared_strings(QUOTE_QUEUE_PATH)
+    state = {
+        "parserVersion": PARSER_VERSION,
+        "count": count,
+        "outputSize": os.path.getsize(os.path.join(OUT_DIR, "quote-queue.json")),
+        "lastRowNum": record.rowNum if record else 0,
+        "sectionYear": year,
+        "lastRecord": _record_digest(record) if record else None,
+        "rowPrefix": _queue_row_prefix(session, record.rowNum) if record else None,
+        "sharedStrings": {"count": len(strings), "digest": _strings_digest(strings, len(strings))},
+    }
+    write_json_document(state, QUEUE_STATE_PATH)
+
+
+def _queue_row_prefix(session, row):
+    with PROFILER.stage("prefix hash"):
+        return session.row_prefix_digest(QUOTE_QUEUE_PATH, sheet_schemas()["queue"]["sheet"], row)
+
+
+def _copy_prefix(src, dst, length):
+    """Copy the first length bytes of open file src to dst in 1 MB chunks."""
+    while length > 0:
+        chunk = src.read(min(length, 1 << 20))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def append_json(records, filename):
+    """
+    Append records to a JSON array file written by write_json.
+
+    Produces exactly the bytes write_json would write for the merged list,
+    without re-reading or re-serializing the existing records: the old bytes
+    are copied (minus the closing bracket) into a temp file, the new records
+    are appended, and the result is renamed into place. A <name>.ndjson
+    companion, if present, is extended the same way.
+    """
+    path = os.path.join(OUT_DIR, filename)
+    if not records:
+        print(f"  -> Unchanged {filename}: 0 new records")
+        return
+    size = os.path.getsize(path)
+    with open(path, "rb") as src, AtomicOutput(path, binary=True) as dst:
+        src.seek(size - 2)
+        if src.read(2) != b"\n]":
+            raise ValueError(f"{filename} is not an indented JSON array")
+        src.seek(0)
+        _copy_prefix(src, dst, size - 2)
+        for record in records:
+            with PROFILER.stage("serialization"):
+                chunk = (",\n" + _indented_item(record)).encode()
+            dst.write(chunk)
+        dst.write(b"\n]")
+
+    ndjson_path = path[:-len(".json")] + ".ndjson"
+    if WRITE_NDJSON and os.path.exists(ndjson_path):
+        with open(ndjson_path, "rb") as src, AtomicOutput(ndjson_path, binary=True) as dst:
+            _copy_prefix(src, dst, os.path.getsize(ndjson_path))
+            for record in records:
+                dst.write((json.dumps(_as_json(record), default=str) + "\n").encode())
+    print(f"  -> Appended {filename}: {len(records)} records")
+
+
+def _write_queue_delta(mode, after_row, records):
+    delta = {
+        # "append": records are the rows after afterRowNum
+        # "full": quote-queue.json was rebuilt from scratch; reload it (records is empty)
+        "mode": mode,
+        "afterRowNum": after_row,
+        "count": len(records),
+        "records": [record._asdict() for record in records],
+    }
+    write_json_document(delta, os.path.join(OUT_DIR, QUEUE_DELTA_FILE))
+    print(f"  -> Wrote {QUEUE_DELTA_FILE}: {mode}, {len(records)} records")
+
+
+def parse_quote_queue_delta(session):
+    """
+    Delta-mode variant of parse_quote_queue.
+
+    Writes quote-queue.delta.json with the new records and the merged
+    quote-queue.json; returns the merged record count.
+    """
+    print("\n[3/10] Parsing Quote Queue via raw XML (delta mode)...")
+    out_path = os.path.join(OUT_DIR, "quote-queue.json")
+    state = None
+    if os.path.exists(QUEUE_STATE_PATH):
+        with open(QUEUE_STATE_PATH) as f:
+            state = json.load(f)
+
+    reason = None
+    if state is None or not os.path.exists(out_path):
+        reason = "no previous run"
+    elif state.get("parserVersion") != PARSER_VERSION:
+        reason = "parser version changed"
+    elif state.get("outputSize") != os.path.getsize(out_path) or state["count"] == 0:
+        reason = "quote-queue.json changed since last run"
+    else:
+        last_row = state["lastRowNum"]
+        known = state.get("sharedStrings") or {"count": 0, "digest": None}
+        unchanged = (
+            _queue_row_prefix(session, last_row) == state.get("rowPrefix")
+            and _strings_digest(session.shared_strings(QUOTE_QUEUE_PATH), known["count"]) == known["digest"]
+        )
+        rows = iter_quote_queue(session, min_row=last_row, start_year=state.get("sectionYear"))
+        last = next(rows, None) if unchanged else None
+        if last is None or last[0].rowNum != last_row or _record_digest(last[0]) != state.get("lastRecord"):
+            reason = "earlier rows were edited"
+        else:
+            new_records = []
+            for last in rows:  # last ends as the newest (record, year) for the state
+                new_records.append(last[0])
+
+    if reason is not None:
+        print(f"  Falling back to a full parse ({reason})")
+        count = _parse_quote_queue_full(session)
+        _write_queue_delta("full", 0, [])
+        return count
+
+    append_json(new_records, "quote-queue.json")
+    _write_queue_delta("append", last_row, new_records)
+    count = state["count"] + len(new_records)
+    save_queue_state(session, last, count)
+    return count
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 4 & 5. STAFF + DEALERS — from Quote Template "Dropdown Menus" sheet
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+StaffRecord = namedtuple("StaffRecord", "name email initials")
+DealerRecord = namedtuple("DealerRecord", "name")
+
+
+def extract_template_dropdowns(session):
+    """
+    Dropdown Menus sheet layout:
+      Rows 1-4: Staff (col A = name, col B = email). Row 5-6 are blank.
+      Rows 7-19: Dealers (col A = dealer name).
+
+    The split is: staff have an email in column B; dealers don't
+    (except row 11 CRG has "Data Validation" in B which is a label, not an email).
+    Returns ([StaffRecord], [DealerRecord]).
+    """
+    staff = []
+    dealers = []
+
+    schema = sheet_schemas()["template"]
+    layout = session.layout(QUOTE_TEMPLATE_PATH, schema)
+    rows = session.rows(
+        QUOTE_TEMPLATE_PATH, layout.sheet, min_row=layout.first_row, max_row=schema.get("maxRow"),
+        max_col=layout.max_col,
+    )
+    for _, vals in rows:
+        name = safe_str(vals[layout.index["name"]])    # A
+        email = safe_str(vals[layout.index["email"]])  # B
+
+        if not name:
+            PROFILER.skip("template", "no name")
+            continue
+
+        # Staff have a proper email address
+        if "@" in email:
+            staff.append(StaffRecord(name, email, _get_initials(name)))
+        else:
+            # It's a dealer (skip non-dealer labels)
+            if email and "validation" in email.lower():
+                pass  # skip metadata label
+            dealers.append(DealerRecord(name))
+
+    return staff, dealers
+
+
+def parse_template_dropdowns(session):
+    """Extract and write staff.json and dealers.json; returns both counts."""
+    print("\n[4/10] Parsing staff list from Quote Template...")
+    print("[5/10] Parsing dealer list from Quote Template...")
+    staff, dealers = extract_template_dropdowns(session)
+    write_json(staff, "staff.json")
+    write_json(dealers, "dealers.json")
+    return len(staff), len(dealers)
+
+
+def _get_initials(name):
+    """Generate initials from a full name: 'Mark Fleck' → 'MAF'."""
+    # Known mappings from the quote numbering convention
+    known = {
+        "Mark Fleck": "MAF",
+        "Brian Craig": "BC",
+        "Samatha Sander": "SS",
+        "Maya Mitchell": "MM",
+    }
+    if name in known:
+        return known[name]
+    parts = name.split()
+    return "".join(p[0].upper() for p in parts if p)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 6. QUOTE QUEUE METRICS — derived from quote-queue.json records
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Revision markers: "-REV A", trailing ".B"/"-C" (optionally ".B1"), or "-2" reissues
+_REVISION_RE = re.compile(r"rev|[.\-][B-Z]\d?$|-\d+$", re.IGNORECASE)
+
+_DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_QUARTERS = [("Q1", "Jan-Mar"), ("Q2", "Apr-Jun"), ("Q3", "Jul-Sep"), ("Q4", "Oct-Dec")]
+
+# Manual data-entry model behind dataReEntryAnalysis
+_ENTRIES_PER_QUOTE = 3
+_ORDER_CONVERSION = 0.30
+_MINUTES_PER_ENTRY = 3
+
+
+def _queue_datetime(iso):
+    """datetime for a record's dateIso / statusIso; None if it is missing."""
+    return datetime.fromisoformat(iso) if iso else None
+
+
+def _median_sorted(values):
+    n = len(values)
+    mid = n // 2
+    return values[mid] if n % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def _turnaround_stats(hours):
+    """Average/median turnaround for a list of hours (sorted in place)."""
+    hours.sort()
+    avg = sum(hours) / len(hours) if hours else 0.0
+    median = _median_sorted(hours) if hours else 0.0
+    return {
+        "averageHours": round(avg, 2),
+        "averageDays": round(avg / 24, 2),
+        "medianHours": round(median, 2),
+        "medianDays": round(median / 24, 2),
+        "count": len(hours),
+    }
+
+
+def _pct(part, whole, digits=1):
+    return round(part / whole * 100, digits) if whole else 0.0
+
+
+def build_queue_metrics(records):
+    """
+    Compute every quote-queue-metrics.json section from parsed queue records.
+
+    One pass over the records splits them into column arrays (year, turnaround
+    hours, special flag, staff, dealer, received weekday/month); each section
+    then aggregates those columns. Medians sort each group's hours once.
+
+    Turnaround is statusIso - dateIso in hours, so a quote received in
+    December and finished in January spans the new year; a status dated
+    before its receipt is a typo and left out. Dealer is the part of
+    dealerProject before " - ".
+    """
+    total = len(records)
+
+    # ── Single pass: build columns ──
+    quotes_by_year = {}
+    hours_all = []
+    hours_by_year = {}
+    hours_special = []
+    hours_standard = []
+    staff_total = {}
+    staff_special = {}
+    dealer_counts = {}
+    weekday_counts = [0] * 7
+    month_counts = [0] * 12
+    with_numbers = 0
+    with_revisions = 0
+
+    for rec in records:
+        year = rec.get("year")
+        special = rec.get("special") is True
+        staff = rec.get("staff") or ""
+        quotes_by_year[year] = quotes_by_year.get(year, 0) + 1
+        staff_total[staff] = staff_total.get(staff, 0) + 1
+        if special:
+            staff_special[staff] = staff_special.get(staff, 0) + 1
+
+        dealer_project = rec.get("dealerProject") or ""
+        if dealer_project:
+            dealer = dealer_project.split(" - ", 1)[0].strip()
+            dealer_counts[dealer] = dealer_counts.get(dealer, 0) + 1
+
+        quote_number = rec.get("quoteNumber") or ""
+        if quote_number:
+            with_numbers += 1
+            if _REVISION_RE.search(quote_number):
+                with_revisions += 1
+
+        received = _queue_datetime(rec.get("dateIso"))
+        if received is None:
+            continue
+        weekday_counts[received.weekday()] += 1
+        month_counts[received.month - 1] += 1
+
+        completed = _queue_datetime(rec.get("statusIso"))
+        if completed is None or completed < received:
+            continue
+        hours = (completed - received).total_seconds() / 3600
+        hours_all.append(hours)
+        hours_by_year.setdefault(year, []).append(hours)
+        (hours_special if special else hours_standard).append(hours)
+
+    # ── Turnaround ──
+    overall = _turnaround_stats(hours_all)
+    overall_out = {
+        "count": overall["count"],
+        "averageHours": overall["averageHours"],
+        "averageDays": overall["averageDays"],
+        "medianHours": overall["medianHours"],
+        "medianDays": overall["medianDays"],
+        "minHours": round(hours_all[0], 2) if hours_all else 0.0,
+        "maxHours": round(hours_all[-1], 2) if hours_all else 0.0,
+        "maxDays": round(hours_all[-1] / 24, 2) if hours_all else 0.0,
+    }
+    by_year = []
+    for year in sorted(y for y in hours_by_year if y is not None):
+        stats = _turnaround_stats(hours_by_year[year])
+        by_year.append({"year": year, **stats})
+
+    # ── Staff ──
+    staff_distribution = []
+    top_staff = sorted(
+        ((name, n) for name, n in staff_total.items() if name), key=lambda kv: -kv[1]
+    )[:5]
+    for name, n in top_staff:
+        special = staff_special.get(name, 0)
+        staff_distribution.append({
+            "staff": name,
+            "total": n,
+            "special": special,
+            "specialPercent": _pct(special, n),
+            "standard": n - special,
+            "standardPercent": _pct(n - special, n),
+        })
+
+    # ── Growth ──
+    years = sorted(y for y in quotes_by_year if y is not None)
+    growth = []
+    for i, year in enumerate(years):
+        prev = quotes_by_year[years[i - 1]] if i else None
+        growth.append({
+            "year": year,
+            "quotes": quotes_by_year[year],
+            "growthRate": _pct(quotes_by_year[year] - prev, prev) if prev else None,
+        })
+    # The latest year is still in progress, so CAGR runs to the last complete year
+    cagr_key, cagr = None, None
+    if len(years) >= 3:
+        first, last = years[0], years[-2]
+        cagr_key = f"cagr{first}to{last}"
+        ratio = quotes_by_year[last] / quotes_by_year[first]
+        cagr = round((ratio ** (1 / (last - first)) - 1) * 100, 1)
+
+    # ── Peaks ──
+    dated = sum(month_counts)
+    peak = {
+        "dayOfWeek": [
+            {"day": _DAY_NAMES[i], "count": n, "percent": _pct(n, dated)}
+            for i, n in enumerate(weekday_counts)
+        ],
+        "month": [
+            {"month": _MONTH_NAMES[i], "count": n, "percent": _pct(n, dated)}
+            for i, n in enumerate(month_counts)
+        ],
+        "quarterly": [],
+    }
+    for q, (quarter, months) in enumerate(_QUARTERS):
+        n = sum(month_counts[q * 3:q * 3 + 3])
+        peak["quarterly"].append(
+            {"quarter": quarter, "months": months, "count": n, "percent": _pct(n, dated)}
+        )
+
+    # ── Dealers ──
+    ranked = sorted(dealer_counts.items(), key=lambda kv: -kv[1])
+    with_dealer = sum(dealer_counts.values())
+
+    def top(n):
+        dealers = [
+            {"name": name, "count": count, "percent": _pct(count, with_dealer)}
+            for name, count in ranked[:n]
+        ]
+        count = sum(d["count"] for d in dealers)
+        return {"dealers": dealers, "totalCount": count, "totalPercent": _pct(count, with_dealer)}
+
+    # ── Manual data re-entry ──
+    base_entries = total * _ENTRIES_PER_QUOTE
+    order_entries = int(total * _ORDER_CONVERSION)
+    total_entries = base_entries + order_entries + with_revisions
+    total_minutes = total_entries * _MINUTES_PER_ENTRY
+    total_hours = round(total_minutes / 60)
+
+    metrics = {
+        "generatedAt": datetime.now().strftime("%Y-%m-%d"),
+        "totalQuotes": total,
+        "turnaroundTimes": {
+            "overall": overall_out,
+            "byYear": by_year,
+            "special": _turnaround_stats(hours_special),
+            "standard": _turnaround_stats(hours_standard),
+        },
+        "staffDistribution": staff_distribution,
+        "revisions": {
+            "quotesWithRevisions": with_revisions,
+            "totalQuotesWithNumbers": with_numbers,
+            "revisionRate": _pct(with_revisions, with_numbers),
+        },
+        "yearOverYearGrowth": growth,
+    }
+    if cagr_key:
+        metrics[cagr_key] = cagr
+    metrics["peakAnalysis"] = peak
+    metrics["dealerConcentration"] = {
+        "totalUniqueDealers": len(dealer_counts),
+        "top5": top(5),
+        "top10": top(10),
+    }
+    metrics["dataReEntryAnalysis"] = {
+        "totalQuotes": total,
+        "baseEntries": base_entries,
+        "baseEntriesDescription": "3 per quote (Queue + Quote Table + Quote Template)",
+        "orderEntries": order_entries,
+        "orderEntriesDescription": "Est. 30% conversion to orders = 1 additional entry per order",
+        "revisionEntries": with_revisions,
+        "revisionEntriesDescription": "1 additional entry per revision in template",
+        "totalManualDataEntryEvents": total_entries,
+        "averagePerQuote": round(total_entries / total, 2) if total else 0.0,
+        "estimatedTimeSpent": {
+            "minutesPerEntry": _MINUTES_PER_ENTRY,
+            "totalMinutes": total_minutes,
+            "totalHours": total_hours,
+            "workWeeks": round(total_hours / 40),
+        },
+    }
+    return metrics
+
+
+def parse_queue_metrics():
+    """
+    Build quote-queue-metrics.json from the quote-queue.json just written.
+
+    Reads the output file rather than in-memory records so it works the same
+    after a serial, --jobs or --queue-delta queue run.
+    """
+    print("\n[6/10] Computing quote queue metrics...")
+    with open(os.path.join(OUT_DIR, "quote-queue.json")) as f:
+        records = json.load(f)
+    metrics = build_queue_metrics(records)
+    written = write_json_document(metrics, os.path.join(OUT_DIR, "quote-queue-metrics.json"))
+    action = "Wrote" if written else "Unchanged"
+    print(f"  -> {action} quote-queue-metrics.json: {metrics['totalQuotes']} quotes summarized")
+    return metrics["totalQuotes"]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 7. SKU INDEX — derived from profit-analysis.json + product-catalog.json
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# sku-index.json lets consumers find records without scanning the arrays.
+# Offsets are positions in the corresponding output file; SKUs repeat in both
+# sheets, so every SKU maps to a list.
+#
+#   {"format": "sku-index-v1", "counts": {"catalog": 6100, "profit": 589},
+#    "skus": ["01RD36T-3P", ...],                      sorted, distinct
+#    "catalog": {"01RD36T-3P": [17], ...},             SKU → catalog offsets
+#    "profit": {"01RD36T-3P": [3, 41], ...},           SKU → profit offsets
+#    "profitToCatalog": [17, null, ...],               per profit row (first match)
+#    "facets": {"series": {"01": ["01RD36T-3P", ...]}, "shape": ..., "size": ...,
+#               "baseType": ...},
+#    "prefixDepth": 4,
+#    "prefixes": {"0": [0, 212], "01": [0, 35], ...}}  prefix → [lo, hi) in skus
+#
+# prefixes is a prefix trie flattened to PREFIX_DEPTH characters: a type-ahead
+# resolves the prefix in one lookup and slices skus; longer prefixes narrow
+# the slice from their first PREFIX_DEPTH characters.
+
+SKU_INDEX_FORMAT = "sku-index-v1"
+SKU_FACETS = ("series", "shape", "size", "baseType")
+PREFIX_DEPTH = 4
+
+
+def _load_output(filename):
+    """Records of an output already in OUT_DIR ([] if it hasn't been written)."""
+    text = _read_text(os.path.join(OUT_DIR, filename))
+    return json.loads(text) if text is not None else []
+
+
+def _offsets_by_sku(records):
+    offsets = {}
+    for offset, record in enumerate(records):
+        offsets.setdefault(record["sku"], []).append(offset)
+    return offsets
+
+
+def build_sku_index(catalog, profit):
+    """Build the sku-index-v1 structure from catalog and profit records."""
+    catalog_offsets = _offsets_by_sku(catalog)
+    profit_offsets = _offsets_by_sku(profit)
+    skus = sorted(catalog_offsets.keys() | profit_offsets.keys())
+
+    facets = {facet: {} for facet in SKU_FACETS}
+    for sku in skus:
+        with PROFILER.stage("sku decode"):
+            parts = decode_sku(sku)
+        for facet in SKU_FACETS:
+            value = getattr(parts, facet)
+            if value:
+                facets[facet].setdefault(value, []).append(sku)
+
+    prefixes = {}
+    for pos, sku in enumerate(skus):
+        for length in range(1, min(PREFIX_DEPTH, len(sku)) + 1):
+            span = prefixes.get(sku[:length])
+            if span is None:
+                prefixes[sku[:length]] = [pos, pos + 1]
+            else:
+                span[1] = pos + 1  # skus is sorted, so each prefix is one contiguous run
+
+    return {
+        "format": SKU_INDEX_FORMAT,
+        "counts": {"catalog": len(catalog), "profit": len(profit)},
+        "skus": skus,
+        "catalog": catalog_offsets,
+        "profit": profit_offsets,
+        "profitToCatalog": [
+            catalog_offsets[record["sku"]][0] if record["sku"] in catalog_offsets else None
+            for record in profit
+        ],
+        "facets": {facet: dict(sorted(values.items())) for facet, values in facets.items()},
+        "prefixDepth": PREFIX_DEPTH,
+        "prefixes": prefixes,
+    }
+
+
+def parse_sku_index():
+    """
+    Build sku-index.json from the profit-analysis.json and product-catalog.json
+    in OUT_DIR, so it also covers a run where only one of them was re-extracted.
+    Returns the number of distinct SKUs indexed.
+    """
+    print("\n[7/10] Building SKU index...")
+    catalog = _load_output("product-catalog.json")
+    profit = _load_output("profit-analysis.json")
+    index = build_sku_index(catalog, profit)
+    with PROFILER.stage("serialization"):
+        payload = json.dumps(index, separators=(",", ":")).encode()
+    written = _write_if_changed(os.path.join(OUT_DIR, "sku-index.json"), payload)
+    linked = sum(offset is not None for offset in index["profitToCatalog"])
+    action = "Wrote" if written else "Unchanged"
+    print(f"  -> {action} sku-index.json: {len(index['skus']):,} SKUs, "
+          f"{linked:,}/{len(profit):,} profit rows linked to the catalog")
+    return len(index["skus"])
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 8. MARGIN ROLLUPS — derived from profit-analysis.json + product-catalog.json
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# Group-by cubes so the pricing and catalog pages load aggregates instead of
+# scanning the full arrays. Each cube groups one output by a combination of up
+# to ROLLUP_MAX_DIMS decoded-SKU dimensions ("all" is the grand total) and
+# stores, per group, the row count and n/min/max/mean/percentiles of every
+# measure, column-wise like --columnar. All cubes together run to ~600 KB, so
+# each is its own file under ROLLUP_DIR (the largest ~85 KB) and
+# margin-rollups.json is a few-KB index a page reads to find the one it needs:
+#
+#   margin-rollups.json
+#   {"format": "margin-rollups-v2", "counts": {"catalog": 6100, "profit": 589},
+#    "dimensions": ["series", "shape", "size", "baseType"],
+#    "measures": ["gpm", "netProfit", "newNetProfit", ..., "margin_50_20", ...],
+#    "percentiles": [10, 25, 50, 75, 90],
+#    "cubes": {"catalog": {"all": {"file": "margin-rollups/catalog.all.json", "groups": 1},
+#                          "series+shape": {"file": "margin-rollups/catalog.series+shape.json",
+#                                           "groups": 88}, ...},
+#              "profit": {...}}}
+#
+#   margin-rollups/catalog.series.json
+#   {"source": "catalog", "grouping": "series", "dimensions": ["series"],
+#    "keys": [["01"], ["02"], ...], "count": [212, 96, ...],
+#    "measures": {"gpm": {"n": [...], "min": [...], "max": [...], "mean": [...],
+#                         "p10": [...], ...}, ...}}
+#
+# margin_<tier> is the sheet's net-profit formula at that tier's price,
+# (price - totalCost * (1 + freightOutPct)) / price - commission, i.e. what
+# newNetProfit would be if netPrice were the tier price. Missing values are
+# left out of a measure's stats (n counts the rest). Deeper combinations are
+# left out: all four dimensions give ~2,500 mostly single-row groups, which is
+# the row set again.
+
+ROLLUP_FORMAT = "margin-rollups-v2"
+ROLLUP_DIR = "margin-rollups"
+ROLLUP_DIMENSIONS = SKU_FACETS
+ROLLUP_MAX_DIMS = 2
+ROLLUP_MEASURES = ("gpm", "netProfit", "newNetProfit", "totalCost", "standardPrice", "netPrice")
+ROLLUP_PERCENTILES = (10, 25, 50, 75, 90)
+ROLLUP_DIGITS = 4
+
+
+def tier_margin(record, price):
+    """Net-profit fraction of record sold at price (None without a price or cost)."""
+    cost = record.get("totalCost")
+    if not price or cost is None:
+        return None
+    return (price - cost * (1 + (record.get("freightOutPct") or 0))) / price - (record.get("commission") or 0)
+
+
+def _rollup_columns(records):
+    """Per-row dimension tuples and {measure: column}, margin_* added per discount tier."""
+    dims = []
+    for record in records:
+        with PROFILER.stage("sku decode"):
+            parts = decode_sku(record["sku"])
+        dims.append(tuple(getattr(parts, dim) or None for dim in ROLLUP_DIMENSIONS))
+    columns = {measure: [record.get(measure) for record in records] for measure in ROLLUP_MEASURES}
+    for field, _ in discount_tiers():
+        columns["margin" + field[len("price"):]] = [tier_margin(record, record.get(field)) for record in records]
+    return dims, columns
+
+
+def _percentile(values, pct):
+    """Linearly interpolated percentile of sorted values (numpy's default)."""
+    pos = (len(values) - 1) * pct / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+def _stat_columns(buckets):
+    """{"n", "min", "max", "mean", "p10", ...} arrays over per-group sorted value lists."""
+    def rounded(value):
+        return round(value, ROLLUP_DIGITS) if value is not None else None
+
+    stats = {"n": [], "min": [], "max": [], "mean": []}
+    stats.update((f"p{pct}", []) for pct in ROLLUP_PERCENTILES)
+    for values in buckets:
+        stats["n"].append(len(values))
+        stats["min"].append(rounded(values[0]) if values else None)
+        stats["max"].append(rounded(values[-1]) if values else None)
+        stats["mean"].append(rounded(sum(values) / len(values)) if values else None)
+        for pct in ROLLUP_PERCENTILES:
+            stats[f"p{pct}"].append(rounded(_percentile(values, pct)) if values else None)
+    return stats
+
+
+def _group_sort_key(key):
+    return tuple((value is None, value or "") for value in key)
+
+
+def build_rollup_cube(records):
+    """
+    {grouping: {"dimensions", "keys", "count", "measures": {measure: stat
+    columns}}} for every combination of up to ROLLUP_MAX_DIMS dimensions. Each measure column is sorted once;
+    walking rows in that order fills every group's values already sorted, so
+    percentiles need no per-group sort.
+    """
+    dims, columns = _rollup_columns(records)
+    orders = {}
+    for measure, column in columns.items():
+        order = [row for row, value in enumerate(column) if value is not None]
+        order.sort(key=column.__getitem__)
+        orders[measure] = order
+
+    cube = {}
+    for depth in range(ROLLUP_MAX_DIMS + 1):
+        for combo in combinations(range(len(ROLLUP_DIMENSIONS)), depth):
+            name = "+".join(ROLLUP_DIMENSIONS[dim] for dim in combo) or "all"
+            group_of = [tuple(row_dims[dim] for dim in combo) for row_dims in dims]
+            keys = sorted(set(group_of), key=_group_sort_key)
+            slot = {key: pos for pos, key in enumerate(keys)}
+            slots = [slot[key] for key in group_of]
+            counts = [0] * len(keys)
+            for pos in slots:
+                counts[pos] += 1
+            entry = {
+                "dimensions": [ROLLUP_DIMENSIONS[dim] for dim in combo],
+                "keys": [list(key) for key in keys],
+                "count": counts,
+                "measures": {},
+            }
+            for measure, order in orders.items():
+                column = columns[measure]
+                buckets = [[] for _ in keys]
+                for row in order:
+                    buckets[slots[row]].append(column[row])
+                entry["measures"][measure] = _stat_columns(buckets)
+            cube[name] = entry
+    return cube
+
+
+def build_margin_rollups(catalog, profit):
+    """
+    Build the margin-rollups-v2 index from catalog and profit records, with
+    the cubes themselves inline (parse_margin_rollups splits them out).
+    """
+    measures = list(ROLLUP_MEASURES)
+    measures += ["margin" + field[len("price"):] for field, _ in discount_tiers()]
+    return {
+        "format": ROLLUP_FORMAT,
+        "counts": {"catalog": len(catalog), "profit": len(profit)},
+        "dimensions": list(ROLLUP_DIMENSIONS),
+        "measures": measures,
+        "percentiles": list(ROLLUP_PERCENTILES),
+        "cubes": {"catalog": build_rollup_cube(catalog), "profit": build_rollup_cube(profit)},
+    }
+
+
+def parse_margin_rollups():
+    """
+    Build margin-rollups.json from the profit-analysis.json and
+    product-catalog.json in OUT_DIR. Returns the number of groups written.
+    """
+    print("\n[8/10] Building margin rollups...")
+    catalog = _load_output("product-catalog.json")
+    profit = _load_output("profit-analysis.json")
+    rollups = build_margin_rollups(catalog, profit)
+    cube_dir = os.path.join(OUT_DIR, ROLLUP_DIR)
+    os.makedirs(cube_dir, exist_ok=True)
+    refs, files, sizes, changed = {}, set(), [], 0
+    for source, cube in rollups["cubes"].items():
+        refs[source] = {}
+        for name, entry in cube.items():
+            filename = f"{source}.{name}.json"
+            with PROFILER.stage("serialization"):
+                payload = json.dumps(
+                    {"source": source, "grouping": name, **entry}, separators=(",", ":")
+                ).encode()
+            changed += _write_if_changed(os.path.join(cube_dir, filename), payload)
+            refs[source][name] = {"file": f"{ROLLUP_DIR}/{filename}", "groups": len(entry["keys"])}
+            files.add(filename)
+            sizes.append(len(payload))
+    for filename in os.listdir(cube_dir):
+        if filename.endswith(".json") and filename not in files:
+            os.remove(os.path.join(cube_dir, filename))  # a grouping that is no longer built
+    index = {**rollups, "cubes": refs}
+    with PROFILER.stage("serialization"):
+        payload = json.dumps(index, separators=(",", ":")).encode()
+    written = _write_if_changed(os.path.join(OUT_DIR, "margin-rollups.json"), payload)
+    groups = sum(ref["groups"] for cube in refs.values() for ref in cube.values())
+    action = "Wrote" if written or changed else "Unchanged"
+    print(f"  -> {action} margin-rollups.json: {groups:,} groups in {len(sizes)} cube files "
+          f"({changed} changed), index {len(payload) / 1024:,.1f} KB, "
+          f"largest cube {max(sizes) / 1024:,.0f} KB")
+    return groups
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 9. COST MODEL — the sheets' cost → price formulas, recomputed from components
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# totalCost, standardPrice, netProfit and newNetProfit are cached formula
+# results in the workbooks, so changing freight-out %, GPM or commission
+# needs Excel to recalculate. The model rebuilds them per row:
+#
+#   assemblyCost  = top + route + base + NE/FD/FT + ASB/GN/LC (x2)   Smith/Valley
+#   totalCost     = assemblyCost + LF + edge + freight in + PKG
+#   landed        = totalCost * (1 + freightOutPct)
+#   standardPrice = landed * (1 + gpm) * (1 + commission)
+#   netPrice      = listPrice * (1 - discountFactor)
+#   netProfit     = 1 - landed / standardPrice - commission
+#   newNetProfit  = 1 - landed / netPrice - commission
+#
+# Like price_tiers(), it works on columns: cost_columns() turns the records
+# into input columns once, and evaluate_scenario() computes whole output
+# columns per scenario, broadcasting a scenario's overrides (SCENARIO_PARAMS)
+# across every row. check_cost_model() runs the sheets' own parameters and
+# lists the rows where a cached value is off by more than MODEL_TOLERANCE;
+# cost-model-check.json holds those flags. --what-if FILE sweeps scenarios over
+# product-catalog.json and writes what-if.json (one summary per scenario).
+
+SUBTOTAL_FIELDS = ("topCost", "routeCost", "baseCost", "nestFoldCost", "asbGnLcCost1", "asbGnLcCost2")
+TOTAL_FIELDS = ("lfCost", "edgeCost", "freightInCost")  # added to the subtotal, with packagingCost
+SCENARIO_PARAMS = ("freightOutPct", "gpm", "commission", "packagingCost", "discountFactor")
+MODEL_FIELDS = ("assemblyCost", "totalCost", "standardPrice", "netPrice", "netProfit", "newNetProfit")
+
+# Largest |cached - model| not flagged: half a cent, or 0.005 percentage points
+MODEL_TOLERANCE = {
+    "assemblyCost": 0.005,
+    "totalCost": 0.005,
+    "standardPrice": 0.005,
+    "netPrice": 0.005,
+    "netProfit": 0.00005,
+    "newNetProfit": 0.00005,
+}
+
+COST_MODEL_FORMAT = "cost-model-check-v1"
+WHAT_IF_FORMAT = "what-if-v1"
+
+
+def cost_columns(records):
+    """
+    Model input columns: the Smith/Valley subtotal, the other cost components
+    (less PKG), the scenario parameters with their row-wise +1 / 1- forms, and
+    the total cost and net price at the sheet's own parameters, which a
+    scenario reuses unless it overrides PKG or the discount.
+    """
+    def column(field):
+        return [record.get(field) or 0 for record in records]
+
+    columns = {param: column(param) for param in SCENARIO_PARAMS}
+    columns["subtotal"] = [sum(record.get(field) or 0 for field in SUBTOTAL_FIELDS) for record in records]
+    columns["base"] = [
+        sub + sum(record.get(field) or 0 for field in TOTAL_FIELDS)
+        for sub, record in zip(columns["subtotal"], records)
+    ]
+    columns["total"] = _add(columns["base"], columns["packagingCost"])
+    columns["listPrice"] = column("listPrice")
+    columns["cachedNetPrice"] = [record.get("netPrice") for record in records]
+    columns["netPrice"] = _net_prices(columns, columns["discountFactor"])
+    columns["markup"], columns["margin"] = _markup_margin(columns["gpm"], columns["commission"])
+    return columns
+
+
+# Scenario parameters are either a column (the rows' own values) or one
+# number broadcast to every row; these keep each step a single pass.
+
+def _add(a, b):
+    if isinstance(a, list):
+        return [x + y for x, y in zip(a, b)] if isinstance(b, list) else [x + b for x in a]
+    return [a + y for y in b] if isinstance(b, list) else a + b
+
+
+def _mul(a, b):
+    if isinstance(a, list):
+        return [x * y for x, y in zip(a, b)] if isinstance(b, list) else [x * b for x in a]
+    return [a * y for y in b] if isinstance(b, list) else a * b
+
+
+def _net_prices(columns, disc):
+    """listPrice * (1 - discountFactor), or the cached net price for rows without a list price."""
+    keep = _add(1, _mul(disc, -1))
+    if not isinstance(keep, list):
+        keep = [keep] * len(columns["listPrice"])
+    return [
+        lp * k if lp else cached
+        for lp, k, cached in zip(columns["listPrice"], keep, columns["cachedNetPrice"])
+    ]
+
+
+def _markup_margin(gpm, comm):
+    """
+    standardPrice / landed cost, (1 + gpm) * (1 + commission), and netProfit,
+    1 - landed / standardPrice - commission, which only depends on the markup.
+    """
+    markup = _mul(_add(gpm, 1), _add(comm, 1))
+    inverse = [1 / m for m in markup] if isinstance(markup, list) else 1 / markup
+    return markup, _add(_mul(_add(inverse, comm), -1), 1)
+
+
+def evaluate_scenario(columns, scenario=None):
+    """
+    Output columns {MODEL_FIELDS: [value per row]} for one scenario: a dict
+    overriding any of SCENARIO_PARAMS for every row (None keeps each row's
+    own value). netPrice falls back to the cached one when there is no list
+    price; ratios are None where their price is 0.
+    """
+    scenario = scenario or {}
+
+    def param(name):
+        value = scenario.get(name)
+        return columns[name] if value is None else value
+
+    frt, gpm, comm, pkg, disc = (param(name) for name in SCENARIO_PARAMS)
+    total = columns["total"] if scenario.get("packagingCost") is None else _add(columns["base"], pkg)
+    net_price = columns["netPrice"] if scenario.get("discountFactor") is None else _net_prices(columns, disc)
+    if scenario.get("gpm") is None and scenario.get("commission") is None:
+        markup, margin = columns["markup"], columns["margin"]
+    else:
+        markup, margin = _markup_margin(gpm, comm)
+    landed = _mul(total, _add(frt, 1))
+    standard = _mul(landed, markup)
+    if isinstance(margin, list):
+        net_profit = [m if sp else None for m, sp in zip(margin, standard)]
+    else:
+        net_profit = [margin if sp else None for sp in standard]
+    if isinstance(comm, list):
+        new_net = [1 - cost / np - c if np else None for cost, np, c in zip(landed, net_price, comm)]
+    else:
+        new_net = [1 - cost / np - comm if np else None for cost, np in zip(landed, net_price)]
+    return {
+        "assemblyCost": columns["subtotal"],
+        "totalCost": total,
+        "standardPrice": standard,
+        "netPrice": net_price,
+        "netProfit": net_profit,
+        "newNetProfit": new_net,
+    }
+
+
+def check_cost_model(records):
+    """
+    Rows whose cached sheet values disagree with the model at the sheet's own
+    parameters: [{"offset", "sku", "fields": {field: [sheet, model]}}], offsets
+    into records.
+    """
+    model = evaluate_scenario(cost_columns(records))
+    flagged = {}
+    for field in MODEL_FIELDS:
+        tolerance = MODEL_TOLERANCE[field]
+        for offset, (record, value) in enumerate(zip(records, model[field])):
+            cached = record.get(field)
+            if cached is None:
+                continue
+            if value is None or abs(cached - value) > tolerance:
+                flag = flagged.setdefault(offset, {"offset": offset, "sku": record.get("sku"), "fields": {}})
+                flag["fields"][field] = [cached, round(value, 6) if value is not None else None]
+    return [flagged[offset] for offset in sorted(flagged)]
+
+
+def build_cost_model_check(catalog, profit):
+    """Build the cost-model-check-v1 structure: per-field disagreement counts and the flags."""
+    flags = {"catalog": check_cost_model(catalog), "profit": check_cost_model(profit)}
+    return {
+        "format": COST_MODEL_FORMAT,
+        "counts": {"catalog": len(catalog), "profit": len(profit)},
+        "tolerance": MODEL_TOLERANCE,
+        "disagreements": {
+            source: {field: sum(field in flag["fields"] for flag in source_flags) for field in MODEL_FIELDS}
+            for source, source_flags in flags.items()
+        },
+        "flags": flags,
+    }
+
+
+def parse_cost_model_check():
+    """
+    Build cost-model-check.json from the profit-analysis.json and
+    product-catalog.json in OUT_DIR. Returns the number of rows flagged.
+    """
+    print("\n[9/10] Checking cached cost formulas against the cost model...")
+    catalog = _load_output("product-catalog.json")
+    profit = _load_output("profit-analysis.json")
+    check = build_cost_model_check(catalog, profit)
+    with PROFILER.stage("serialization"):
+        payload = json.dumps(check, separators=(",", ":")).encode()
+    written = _write_if_changed(os.path.join(OUT_DIR, "cost-model-check.json"), payload)
+    rows = 0
+    for source, source_flags in check["flags"].items():
+        fields = ", ".join(f"{n:,} {field}" for field, n in check["disagreements"][source].items() if n)
+        print(f"  {source:<8} {len(source_flags):,}/{check['counts'][source]:,} rows disagree"
+              + (f" ({fields})" if fields else ""))
+        rows += len(source_flags)
+    action = "Wrote" if written else "Unchanged"
+    print(f"  -> {action} cost-model-check.json: {len(payload) / 1024:,.0f} KB")
+    return rows
+
+
+# ── What-if sweeps (--what-if FILE) ──────────────────────────────────────────
+#
+# FILE lists scenarios, and/or a grid whose cartesian product is appended:
+#
+#   {"scenarios": [{"name": "comm 10%", "commission": 0.10}, ...],
+#    "grid": {"gpm": [0.40, 0.45, 0.50], "freightOutPct": [0, 0.04]}}
+#
+# Each scenario overrides SCENARIO_PARAMS for every catalog row. what-if.json
+# summarizes each one against the baseline (the sheet's own parameters).
+
+
+def load_scenarios(path):
+    """Scenarios from a --what-if file, grid combinations last; each gets a name."""
+    with open(path) as f:
+        spec = json.load(f)
+    scenarios = list(spec.get("scenarios", []))
+    grid = spec.get("grid") or {}
+    if grid:
+        names = list(grid)
+        for values in product(*(grid[name] for name in names)):
+            scenarios.append(dict(zip(names, values)))
+    named = []
+    for scenario in scenarios:
+        unknown = scenario.keys() - {"name", *SCENARIO_PARAMS}
+        if unknown:
+            raise ValueError(f"Unknown what-if parameter(s) {sorted(unknown)} in {path}")
+        params = {param: value for param, value in scenario.items() if param != "name"}
+        name = scenario.get("name") or ", ".join(f"{param}={value:g}" for param, value in params.items())
+        named.append({"name": name, **params})
+    return named
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 6) if values else None
+
+
+def what_if(records, scenarios):
+    """One summary per scenario: mean prices and margins, change vs baseline, rows under water."""
+    columns = cost_columns(records)
+    baseline = evaluate_scenario(columns)
+    base_standard = sum(baseline["standardPrice"])
+    summaries = []
+    for scenario in scenarios:
+        model = evaluate_scenario(columns, scenario)
+        standard = sum(model["standardPrice"])
+        summaries.append({
+            **scenario,
+            "meanTotalCost": _mean(model["totalCost"]),
+            "meanStandardPrice": _mean(model["standardPrice"]),
+            "standardPriceChangePct": _pct(standard - base_standard, base_standard, 2),
+            "meanNetProfit": _mean(model["netProfit"]),
+            "meanNewNetProfit": _mean(model["newNetProfit"]),
+            "negativeNewNetProfit": sum(1 for value in model["newNetProfit"] if value is not None and value < 0),
+        })
+    return summaries
+
+
+def run_what_if(path):
+    """Sweep the scenarios in path over product-catalog.json and write what-if.json."""
+    print(f"\nWhat-if sweep: {path}")
+    scenarios = load_scenarios(path)
+    catalog = _load_output("product-catalog.json")
+    started = time.perf_counter()
+    with PROFILER.stage("evaluate"):
+        baseline, *summaries = what_if(catalog, [{"name": "baseline"}, *scenarios])
+    elapsed = time.perf_counter() - started
+    result = {"format": WHAT_IF_FORMAT, "rows": len(catalog), "baseline": baseline, "scenarios": summaries}
+    write_json_document(result, os.path.join(OUT_DIR, "what-if.json"))
+    print(f"  -> Wrote what-if.json: {len(scenarios)} scenarios x {len(catalog):,} rows in {elapsed:.2f}s")
+    return len(scenarios)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 10. QUEUE ENTITIES — dealers and contacts resolved from quote-queue.json
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# dealerProject ("Baldauf - Franciscan Health…") and emailFrom ("Mike Long /
+# Luke Wagner") are typed by hand, so one dealer or contact appears under
+# several spellings ("Elments IV Interiors", "Webb Contract Group", "LOUER").
+# resolve_entities() clusters them in three steps:
+#
+#   normalize  casefold, drop punctuation, "&" → "and", drop legal suffixes
+#              (ENTITY_STOPWORDS). Distinct normalized names are compared,
+#              not rows, so repeats cost nothing.
+#   block      each name gets a key per significant token (its first
+#              BLOCK_PREFIX letters, from the first BLOCK_TOKENS tokens);
+#              only names sharing a key are compared, and keys shared by more
+#              than MAX_BLOCK names (e.g. "off" for office) are not used.
+#   match      a pair merges (union-find) when its similarity ratio reaches
+#              the threshold and the leading tokens agree, so "TJ Office
+#              Furniture" stays apart from "Ace Office Furniture"; contacts
+#              also merge on the same surname when one first name extends the
+#              other ("Jen" / "Jennifer").
+#
+# Dealers named in dealers.json join the clustering, with both halves of a
+# "CFM - Contract Furniture Marketing" entry as aliases, and name any cluster
+# they land in. Other clusters are named after their most frequent spelling.
+# IDs are that name's normalized form, slugged. queue-entities.json holds the
+# entities (most quoted first) and rowDealer / rowContacts arrays aligned with
+# quote-queue.json. It is rebuilt whenever the queue or the template is
+# re-extracted, since either one changes the clusters.
+
+QUEUE_ENTITIES_FORMAT = "queue-entities-v1"
+ENTITY_STOPWORDS = frozenset({"the", "inc", "llc", "ltd", "co", "corp", "corporation", "company", "group"})
+BLOCK_PREFIX = 3
+BLOCK_TOKENS = 3
+MAX_BLOCK = 200
+DEALER_MATCH = 0.9
+CONTACT_MATCH = 0.9
+LEAD_MATCH = 0.75
+
+_ENTITY_PUNCT_RE = re.compile(r"[^\w\s]+")
+_DEALER_SPLIT_RE = re.compile(r"\s+[-–/]\s+|\s+PO\b", re.IGNORECASE)
+_CONTACT_SPLIT_RE = re.compile(r"\s*(?:/|&|,|\band\b)\s*", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def normalize_entity(text):
+    """Comparison form of a dealer or contact name; "" if nothing is left."""
+    text = _ENTITY_PUNCT_RE.sub(" ", text.casefold().replace("&", " and ").replace("'", "").replace("’", ""))
+    tokens = [token for token in text.split() if token not in ENTITY_STOPWORDS]
+    if len(tokens) > 1 and tokens[-1] == "and":  # "Alfred Williams & Co."
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def queue_dealer(dealer_project):
+    """The dealer part of a dealerProject cell: before " - ", " / " or a trailing PO number."""
+    return _DEALER_SPLIT_RE.split(dealer_project or "", 1)[0].strip()
+
+
+def queue_contacts(email_from):
+    """The people (or firms) in an emailFrom cell, split on "/", "&", "," and "and"."""
+    return [part.strip() for part in _CONTACT_SPLIT_RE.split(email_from or "") if part.strip()]
+
+
+def _blocking_keys(name):
+    return {token[:BLOCK_PREFIX] for token in name.split()[:BLOCK_TOKENS] if len(token) >= BLOCK_PREFIX}
+
+
+def _leads_agree(a, b):
+    """Leading tokens are close or one extends the other ("busines" / "business", "friendsoffice" / "friends")."""
+    from difflib import SequenceMatcher  # only entity resolution needs it
+
+    lead_a, lead_b = a.split(" ", 1)[0], b.split(" ", 1)[0]
+    if lead_a.startswith(lead_b) or lead_b.startswith(lead_a):
+        return True
+    return SequenceMatcher(None, lead_a, lead_b, autojunk=False).ratio() >= LEAD_MATCH
+
+
+def _same_contact(a, b):
+    """Same surname, and one first name starts the other ("jen" / "jennifer", "mike" / "m")."""
+    a_tokens, b_tokens = a.split(), b.split()
+    if len(a_tokens) < 2 or len(b_tokens) < 2 or a_tokens[-1] != b_tokens[-1]:
+        return False
+    return a_tokens[0].startswith(b_tokens[0]) or b_tokens[0].startswith(a_tokens[0])
+
+
+def cluster_names(names, threshold, same=None, links=()):
+    """
+    Union-find clusters of normalized names: {name: root name}. Pairs in
+    links are joined up front; otherwise only names sharing a blocking key
+    are compared. Returns (roots, comparisons made).
+    """
+    from difflib import SequenceMatcher  # only entity resolution needs it
+
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for a, b in links:
+        parent[find(b)] = find(a)
+
+    blocks = {}
+    for name in names:
+        for key in _blocking_keys(name):
+            blocks.setdefault(key, []).append(name)
+
+    compared = set()
+    matcher = SequenceMatcher(autojunk=False)
+    for block in blocks.values():
+        if len(block) < 2 or len(block) > MAX_BLOCK:
+            continue
+        for i, a in enumerate(block):
+            matcher.set_seq2(a)
+            for b in block[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                root_a, root_b = find(a), find(b)
+                if root_a == root_b:
+                    continue
+                matcher.set_seq1(b)
+                if (same is not None and same(a, b)) or (
+                    matcher.real_quick_ratio() >= threshold
+                    and matcher.quick_ratio() >= threshold
+                    and matcher.ratio() >= threshold
+                    and _leads_agree(a, b)
+                ):
+                    parent[root_b] = root_a
+    return {name: find(name) for name in names}, len(compared)
+
+
+def _entity_table(spellings, roots, listed=None):
+    """
+    Entities from {raw spelling: rows} and the clusters of their normalized
+    forms; listed maps a normalized alias to its dealers.json name. Returns
+    (entities most quoted first, {normalized name: entity id}).
+    """
+    members, listed_names = {}, {}
+    for raw, rows in spellings.items():
+        members.setdefault(roots[normalize_entity(raw)], []).append((raw, rows))
+    for alias, name in (listed or {}).items():
+        members.setdefault(roots[alias], [])
+        listed_names.setdefault(roots[alias], set()).add(name)
+
+    entities, ids = [], {}
+    for root, variants in members.items():
+        variants.sort(key=lambda item: (-item[1], len(item[0]), item[0]))
+        names = sorted(listed_names.get(root, ()))
+        name = names[0] if names else variants[0][0]
+        entity_id = normalize_entity(name).replace(" ", "-")
+        for raw, _ in variants:
+            ids[normalize_entity(raw)] = entity_id
+        entity = {"id": entity_id, "name": name}
+        if listed is not None:
+            entity["listed"] = bool(names)
+        entity["variants"] = [raw for raw, _ in variants]
+        entity["rows"] = sum(rows for _, rows in variants)
+        entities.append(entity)
+    entities.sort(key=lambda entity: (-entity["rows"], entity["id"]))
+    return entities, ids
+
+
+def resolve_entities(records, dealers=()):
+    """
+    Build the queue-entities-v1 structure for quote-queue.json records and
+    the dealers.json list.
+    """
+    row_dealers = [queue_dealer(rec.get("dealerProject")) for rec in records]
+    row_contacts = [queue_contacts(rec.get("emailFrom")) for rec in records]
+
+    dealer_spellings, contact_spellings = {}, {}
+    for dealer, contacts in zip(row_dealers, row_contacts):
+        if normalize_entity(dealer):
+            dealer_spellings[dealer] = dealer_spellings.get(dealer, 0) + 1
+        for contact in contacts:
+            if normalize_entity(contact):
+                contact_spellings[contact] = contact_spellings.get(contact, 0) + 1
+
+    listed, links = {}, []
+    for dealer in dealers:
+        aliases = [normalize_entity(alias) for alias in [dealer["name"], *dealer["name"].split(" - ")]]
+        aliases = [alias for alias in aliases if alias]
+        for alias in aliases:
+            listed.setdefault(alias, dealer["name"])
+        links += [(aliases[0], alias) for alias in aliases[1:]]
+
+    with PROFILER.stage("clustering"):
+        dealer_names = sorted({normalize_entity(raw) for raw in dealer_spellings} | listed.keys())
+        dealer_roots, dealer_compared = cluster_names(dealer_names, DEALER_MATCH, links=links)
+        contact_names = sorted({normalize_entity(raw) for raw in contact_spellings})
+        contact_roots, contact_compared = cluster_names(contact_names, CONTACT_MATCH, same=_same_contact)
+
+    dealer_entities, dealer_ids = _entity_table(dealer_spellings, dealer_roots, listed)
+    contact_entities, contact_ids = _entity_table(contact_spellings, contact_roots)
+    return {
+        "format": QUEUE_ENTITIES_FORMAT,
+        "counts": {
+            "rows": len(records),
+            "dealers": len(dealer_entities),
+            "dealerSpellings": len(dealer_spellings),
+            "contacts": len(contact_entities),
+            "contactSpellings": len(contact_spellings),
+            "comparisons": dealer_compared + contact_compared,
+        },
+        "dealers": dealer_entities,
+        "contacts": contact_entities,
+        "rowDealer": [dealer_ids.get(normalize_entity(dealer)) for dealer in row_dealers],
+        "rowContacts": [
+            sorted({contact_ids[normalize_entity(c)] for c in contacts if normalize_entity(c)})
+            for contacts in row_contacts
+        ],
+    }
+
+
+def parse_queue_entities():
+    """
+    Build queue-entities.json from the quote-queue.json and dealers.json in
+    OUT_DIR. Returns the number of dealer entities.
+    """
+    print("\n[10/10] Resolving queue dealers and contacts...")
+    records = _load_output("quote-queue.json")
+    entities = resolve_entities(records, _load_output("dealers.json"))
+    with PROFILER.stage("serialization"):
+        payload = json.dumps(entities, separators=(",", ":")).encode()
+    written = _write_if_changed(os.path.join(OUT_DIR, "queue-entities.json"), payload)
+    counts = entities["counts"]
+    listed = sum(entity["listed"] for entity in entities["dealers"])
+    print(f"  dealers:  {counts['dealerSpellings']:,} spellings → {counts['dealers']:,} entities "
+          f"({listed} from dealers.json)")
+    print(f"  contacts: {counts['contactSpellings']:,} spellings → {counts['contacts']:,} entities")
+    action = "Wrote" if written else "Unchanged"
+    print(f"  -> {action} queue-entities.json: {counts['comparisons']:,} comparisons, "
+          f"{len(payload) / 1024:,.0f} KB")
+    return counts["dealers"]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# COLUMNAR OUTPUT (--columnar) — compact companions to the row-oriented files
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# <name>.columnar.json holds one array per field instead of one object per
+# record, so key names appear once. Low-cardinality string fields are
+# dictionary-encoded: the column holds indexes into dictionaries[field].
+#
+#   {"format": "columnar-v1", "count": 3595, "fields": ["rowNum", ...],
+#    "dictionaries": {"staff": ["MM", "SS", ...]},
+#    "columns": {"rowNum": [5, 6, ...], "staff": [0, 0, 1, ...]}}
+
+COLUMNAR_FORMAT = "columnar-v1"
+
+# Fields worth dictionary-encoding (few distinct values, many repeats)
+DICTIONARY_FIELDS = {"series", "shape", "shapeName", "baseType", "staff", "dealerProject"}
+
+# Row-oriented outputs that get a columnar companion
+COLUMNAR_OUTPUTS = [
+    "profit-analysis.json",
+    "product-catalog.json",
+    "quote-queue.json",
+    "staff.json",
+    "dealers.json",
+]
+
+
+def to_columnar(records):
+    """Convert a list of flat records into the columnar-v1 structure."""
+    fields = []
+    seen = set()
+    for record in records:
+        for field in record:
+            if field not in seen:
+                seen.add(field)
+                fields.append(field)
+
+    columns = {}
+    dictionaries = {}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        if field in DICTIONARY_FIELDS:
+            index = {}
+            encoded = []
+            for value in values:
+                if value is None:
+                    encoded.append(None)
+                    continue
+                if value not in index:
+                    index[value] = len(index)
+                encoded.append(index[value])
+            dictionaries[field] = list(index)
+            values = encoded
+        columns[field] = values
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "count": len(records),
+        "fields": fields,
+        "dictionaries": dictionaries,
+        "columns": columns,
+    }
+
+
+def write_columnar(filename, compress=False):
+    """
+    Write the columnar companion of a row-oriented output already in OUT_DIR.
+
+    Reads the row file back so it works after serial, --jobs and --queue-delta
+    runs alike. With compress, writes <name>.columnar.json.gz (mtime zeroed
+    so unchanged data produces identical bytes).
+    """
+    with open(os.path.join(OUT_DIR, filename)) as f:
+        records = json.load(f)
+    with PROFILER.stage("serialization"):
+        payload = json.dumps(to_columnar(records), separators=(",", ":"), default=str).encode()
+    out_name = filename.replace(".json", ".columnar.json")
+    if compress:
+        out_name += ".gz"
+        with PROFILER.stage("serialization"):
+            import gzip  # only --gzip needs it
+
+            payload = gzip.compress(payload, mtime=0)
+    written = _write_if_changed(os.path.join(OUT_DIR, out_name), payload)
+    action = "Wrote" if written else "Unchanged"
+    print(f"  -> {action} {out_name}: {len(records)} records, {len(payload) / 1024:,.0f} KB")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SQLITE EXPORT (--sqlite FILE) — local stand-in for the hosted reference tables
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# Table and column names follow the mappers in scripts/seed-reference-data.ts
+# (and supabase/migrations/001_schema.sql), including their `?? 0` defaults,
+# so queries written against the hosted tables run unchanged locally.
+#
+#   replace  drop and recreate every table, then bulk insert
+#   upsert   insert new keys, update changed ones and delete keys no longer in
+#            the outputs, so the tables end up matching the JSON
+#
+# Upserts need keys that survive rows being inserted above them: catalog and
+# profit rows are keyed on (sku, seq), seq numbering the rows that share a SKU
+# in file order; the queue on row_num; staff and dealers on name.
+#
+# Either way the load is one transaction, and secondary indexes are dropped
+# before it and created after it, so the inserts don't maintain them row by row.
+
+SQLITE_MODES = ("replace", "upsert")
+
+_REAL = "REAL DEFAULT 0"
+_COST_COLUMNS = [
+    ("top_cost", "topCost", _REAL),
+    ("route_cost", "routeCost", _REAL),
+    ("base_cost", "baseCost", _REAL),
+    ("nest_fold_cost", "nestFoldCost", _REAL),
+    ("asb_gn_lc_cost1", "asbGnLcCost1", _REAL),
+    ("asb_gn_lc_cost2", "asbGnLcCost2", _REAL),
+    ("assembly_cost", "assemblyCost", _REAL),
+    ("lf_cost", "lfCost", _REAL),
+]
+_PRICE_COLUMNS = [
+    ("freight_in_cost", "freightInCost", _REAL),
+    ("packaging_cost", "packagingCost", _REAL),
+    ("total_cost", "totalCost", _REAL),
+    ("freight_out_pct", "freightOutPct", _REAL),
+    ("gpm", "gpm", _REAL),
+    ("commission", "commission", _REAL),
+    ("standard_price", "standardPrice", _REAL),
+    ("net_profit", "netProfit", _REAL),
+    ("list_price", "listPrice", _REAL),
+    ("discount_factor", "discountFactor", _REAL),
+    ("net_price", "netPrice", _REAL),
+    ("new_net_profit", "newNetProfit", _REAL),
+]
+
+SqliteTable = namedtuple("SqliteTable", "source key columns indexes")
+
+_SEQ_COLUMN = ("seq", None, "INTEGER NOT NULL")  # filled by _sqlite_rows: nth row with this SKU
+
+
+@lru_cache(maxsize=None)
+def sqlite_tables():
+    """
+    table → (output file, upsert key columns, [(column, record field, SQL
+    type)], indexed columns). SKUs repeat within a sheet, so the catalog and
+    profit keys add seq (see _SEQ_COLUMN). Built on first use, since the
+    price_* columns come from discount-tiers.json.
+    """
+    tier_columns = [(field, field, _REAL) for field, _ in discount_tiers()]
+    return {
+        "product_catalog": SqliteTable(
+            "product-catalog.json", ("sku", "seq"),
+            [
+                ("sku", "sku", "TEXT NOT NULL"),
+                _SEQ_COLUMN,
+                ("series", "series", "TEXT"),
+                ("shape", "shape", "TEXT"),
+                ("shape_name", "shapeName", "TEXT"),
+                ("size", "size", "TEXT"),
+                ("base_type", "baseType", "TEXT"),
+                *_COST_COLUMNS,
+                ("edge_cost", "edgeCost", _REAL),
+                *_PRICE_COLUMNS,
+                *tier_columns,
+                ("notes", "notes", "TEXT"),
+            ],
+            ["sku", "series", "shape"],
+        ),
+        "profit_analysis": SqliteTable(
+            "profit-analysis.json", ("sku", "seq"),
+            [
+                ("tag", "tag", "TEXT"),
+                ("qty", "qty", _REAL),
+                ("sku", "sku", "TEXT NOT NULL"),
+                _SEQ_COLUMN,
+                ("series", "series", "TEXT"),
+                *_COST_COLUMNS,
+                *_PRICE_COLUMNS,
+                ("notes", "notes", "TEXT"),
+                *tier_columns,
+            ],
+            ["sku", "series"],
+        ),
+        "quote_queue": SqliteTable(
+            "quote-queue.json", ("row_num",),
+            [
+                ("row_num", "rowNum", "INTEGER"),
+                ("email_from", "emailFrom", "TEXT"),
+                ("date_time", "dateTime", "TEXT"),
+                ("date_normalized", "dateNormalized", "TEXT"),
+                ("year", "year", "INTEGER"),
+                ("quote_number", "quoteNumber", "TEXT"),
+                ("dealer_project", "dealerProject", "TEXT"),
+                ("special", "special", "INTEGER DEFAULT 0"),
+                ("staff", "staff", "TEXT"),
+                ("status", "status", "TEXT"),
+                ("status_normalized", "statusNormalized", "TEXT"),
+            ],
+            ["year", "staff", "dealer_project"],
+        ),
+        "staff": SqliteTable(
+            "staff.json", ("name",),
+            [
+                ("name", "name", "TEXT NOT NULL"),
+                ("email", "email", "TEXT"),
+                ("initials", "initials", "TEXT NOT NULL"),
+            ],
+            [],
+        ),
+        "dealers": SqliteTable(
+            "dealers.json", ("name",),
+            [("name", "name", "TEXT NOT NULL")],
+            [],
+        ),
+    }
+
+
+def _sqlite_default(sql_type):
+    """Python value for a missing field: the seeder's `?? 0` / `?? false`, else NULL."""
+    return 0 if "DEFAULT 0" in sql_type else None
+
+
+def _sqlite_rows(records, spec):
+    """Parameter tuples for executemany, in spec.columns order, with seq numbered per SKU."""
+    defaults = [(field, _sqlite_default(sql_type)) for _, field, sql_type in spec.columns]
+    seq = spec.columns.index(_SEQ_COLUMN) if _SEQ_COLUMN in spec.columns else None
+    seen = Counter()
+    for record in records:
+        row = [record.get(field) for field, _ in defaults]
+        row = [default if value is None else value for value, (_, default) in zip(row, defaults)]
+        if seq is not None:
+            seen[record.get("sku")] += 1
+            row[seq] = seen[record.get("sku")]
+        yield tuple(row)
+
+
+def _sqlite_create(conn, table, spec, mode):
+    """
+    Create table if missing. In upsert mode a table whose columns no longer
+    match spec (e.g. from before the (sku, seq) keys) is rebuilt instead.
+    """
+    if mode == "upsert":
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if existing and existing != [name for name, _, _ in spec.columns]:
+            print(f"  {table}: columns changed, rebuilding the table")
+            conn.execute(f"DROP TABLE {table}")
+    columns = [f"{name} {sql_type}" for name, _, sql_type in spec.columns]
+    columns.append(f"UNIQUE ({', '.join(spec.key)})")  # ON CONFLICT target for upsert
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+
+
+def _sqlite_insert_sql(table, spec):
+    """INSERT … ON CONFLICT(key) DO UPDATE; in replace mode it only folds duplicate keys."""
+    names = [name for name, _, _ in spec.columns]
+    updates = ", ".join(f"{name} = excluded.{name}" for name in names if name not in spec.key)
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    return (
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+        f"ON CONFLICT ({', '.join(spec.key)}) {action}"
+    )
+
+
+def _sqlite_delete_stale(conn, table, spec, rows):
+    """Delete rows whose key is not among rows (the parameter tuples just upserted)."""
+    positions = [[name for name, _, _ in spec.columns].index(name) for name in spec.key]
+    current = {tuple(row[i] for i in positions) for row in rows}
+    key = ", ".join(spec.key)
+    stale = [k for k in conn.execute(f"SELECT {key} FROM {table}") if k not in current]
+    where = " AND ".join(f"{name} = ?" for name in spec.key)
+    conn.executemany(f"DELETE FROM {table} WHERE {where}", stale)
+    return len(stale)
+
+
+def export_sqlite(path, mode="replace"):
+    """
+    Load the JSON outputs in OUT_DIR (plus quote-queue-metrics.json as a single
+    JSON row) into the SQLite database at path. Outputs that don't exist yet
+    are skipped. Returns {table: rows loaded}; nothing is committed on error.
+    """
+    print(f"\nExporting to SQLite ({mode}): {path}")
+    datasets = {}
+    for table, spec in sqlite_tables().items():
+        text = _read_text(os.path.join(OUT_DIR, spec.source))
+        if text is not None:
+            datasets[table] = json.loads(text)
+    metrics = _read_text(os.path.join(OUT_DIR, "quote-queue-metrics.json"))
+
+    import sqlite3  # only --sqlite needs it
+
+    conn = sqlite3.connect(path, isolation_level=None)  # transactions managed below
+    counts, deleted = {}, {}
+    try:
+        conn.execute("BEGIN")
+        for table, records in datasets.items():
+            spec = sqlite_tables()[table]
+            for column in spec.indexes:
+                conn.execute(f"DROP INDEX IF EXISTS idx_{table}_{column}")
+            if mode == "replace":
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            _sqlite_create(conn, table, spec, mode)
+            rows = list(_sqlite_rows(records, spec))
+            with PROFILER.stage("write"):
+                conn.executemany(_sqlite_insert_sql(table, spec), rows)
+                if mode == "upsert":
+                    deleted[table] = _sqlite_delete_stale(conn, table, spec, rows)
+            counts[table] = len(records)
+        if metrics is not None:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quote_queue_metrics "
+                "(id INTEGER PRIMARY KEY, data TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+            )
+            # One current row, as the seeder keeps it, in both modes
+            conn.execute("DELETE FROM quote_queue_metrics")
+            conn.execute("INSERT INTO quote_queue_metrics (id, data) VALUES (1, ?)", (metrics,))
+            counts["quote_queue_metrics"] = 1
+        with PROFILER.stage("indexes"):
+            for table in datasets:
+                for column in sqlite_tables()[table].indexes:
+                    conn.execute(f"CREATE INDEX idx_{table}_{column} ON {table}({column})")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    for table, count in counts.items():
+        stale = f", {deleted[table]:,} stale rows deleted" if deleted.get(table) else ""
+        print(f"  -> {table}: {count:,} rows{stale}")
+    return counts
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CHANGE-SETS — what changed in each table since it was last seeded
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# Records are grouped by natural key: sku for the catalog and profit sheets
+# (SKUs repeat, so a group can hold several rows), quoteNumber for the queue
+# (rowNum for rows without one), name for staff and dealers. Each group is
+# hashed. .changeset-state.json holds the hashes of what the database was
+# last seeded with, and comparing against it gives, per table,
+# <name>.changes.json:
+#
+#   {"format": "changeset-v1", "table": "product_catalog",
+#    "baseline": false,                  true when the table was never seeded
+#    "inserts": [record, ...],           rows of groups that are new
+#    "updates": [record, ...],           all current rows of groups that changed
+#    "deletes": [{"sku": "..."}, ...],   keys of groups that are gone
+#    "counts": {"inserts": 2, "updates": 5, "deletes": 0}}
+#
+# Applying one means: delete the rows matching every delete, insert and update
+# key, then insert inserts + updates (seed-reference-data.ts --changes), so
+# applying the same change-set twice is harmless.
+#
+# The extractor only writes the current hashes to .changeset-pending.json;
+# the seeder copies a table's entry into .changeset-state.json once it has
+# applied (or fully reseeded) that table. Until then every extraction diffs
+# against the same seeded state, so changes from several runs (or --watch
+# cycles) accumulate in the change-set instead of replacing each other. One
+# pass over each table and dict lookups only: linear in rows.
+
+CHANGESET_FORMAT = "changeset-v1"
+CHANGESET_STATE_FILE = ".changeset-state.json"
+CHANGESET_PENDING_FILE = ".changeset-pending.json"
+
+# table → (output file, key field, fallback key field for records without one)
+CHANGESET_TABLES = {
+    "product_catalog": ("product-catalog.json", "sku", None),
+    "profit_analysis": ("profit-analysis.json", "sku", None),
+    "quote_queue": ("quote-queue.json", "quoteNumber", "rowNum"),
+    "staff": ("staff.json", "name", None),
+    "dealers": ("dealers.json", "name", None),
+}
+
+
+def group_records(records, field, fallback=None):
+    """{(key field, value): [records]} in first-seen order."""
+    groups = {}
+    for record in records:
+        key_field = field
+        value = record.get(field)
+        if not value and fallback:
+            key_field, value = fallback, record.get(fallback)
+        groups.setdefault((key_field, value), []).append(record)
+    return groups
+
+
+def _group_hash(records):
+    h = hashlib.blake2b(digest_size=12)
+    for record in records:
+        h.update(json.dumps(record, sort_keys=True, separators=(",", ":"), default=str).encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _state_key(key):
+    key_field, value = key
+    return f"{key_field}={value}"
+
+
+def diff_table(records, previous, field, fallback=None):
+    """
+    Compare records against previous ({state key: group hash}, or None for no
+    baseline). Returns (change-set body, new state for this table).
+    """
+    groups = group_records(records, field, fallback)
+    state = {}
+    inserts, updates = [], []
+    for key, rows in groups.items():
+        state_key = _state_key(key)
+        digest = state[state_key] = _group_hash(rows)
+        if previous is None or state_key not in previous:
+            inserts.extend(rows)
+        elif previous[state_key] != digest:
+            updates.extend(rows)
+    deletes = []
+    for state_key in (previous or {}).keys() - state.keys():
+        key_field, _, value = state_key.partition("=")
+        deletes.append({key_field: int(value) if key_field == "rowNum" else value})
+    deletes.sort(key=lambda key: str(next(iter(key.values()))))
+    body = {
+        "baseline": previous is None,
+        "inserts": inserts,
+        "updates": updates,
+        "deletes": deletes,
+        "counts": {"inserts": len(inserts), "updates": len(updates), "deletes": len(deletes)},
+    }
+    return body, state
+
+
+def write_changesets():
+    """
+    Diff every output in OUT_DIR against the last seeded state, write the
+    <name>.changes.json files and the pending state for the seeder to
+    promote. Returns {table: counts}.
+    """
+    print("\nComputing change-sets...")
+    text = _read_text(os.path.join(OUT_DIR, CHANGESET_STATE_FILE))
+    previous = json.loads(text)["tables"] if text is not None else {}
+    new_state, totals = {}, {}
+    for table, (filename, field, fallback) in CHANGESET_TABLES.items():
+        records_text = _read_text(os.path.join(OUT_DIR, filename))
+        if records_text is None:
+            continue
+        with PROFILER.stage("diff"):
+            body, new_state[table] = diff_table(
+                json.loads(records_text), previous.get(table), field, fallback
+            )
+        changes = {"format": CHANGESET_FORMAT, "table": table, "source": filename, **body}
+        with PROFILER.stage("serialization"):
+            payload = json.dumps(changes, separators=(",", ":"), default=str).encode()
+        _write_if_changed(os.path.join(OUT_DIR, filename.replace(".json", ".changes.json")), payload)
+        totals[table] = body["counts"]
+        label = "baseline, all inserts" if body["baseline"] else "vs last seed"
+        counts = body["counts"]
+        print(f"  -> {table:<16} +{counts['inserts']:,} ~{counts['updates']:,} "
+              f"-{counts['deletes']:,} ({label})")
+    pending = {"format": CHANGESET_FORMAT, "tables": new_state}
+    _write_if_changed(
+        os.path.join(OUT_DIR, CHANGESET_PENDING_FILE), json.dumps(pending, separators=(",", ":")).encode()
+    )
+    return totals
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# INCREMENTAL RE-EXTRACTION — skip extractors whose source workbook is unchanged
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Rebuilt from profit-analysis.json + product-catalog.json after either is extracted
+TABLE_DERIVED_OUTPUTS = ["sku-index.json", "margin-rollups.json", "cost-model-check.json"]
+
+
+def _extractor_sources():
+    """Extractor name → (source workbook, output files it writes), from the current paths."""
+    return {
+        "profit": (QUOTE_TABLE_PATH, ["profit-analysis.json", *TABLE_DERIVED_OUTPUTS]),
+        "catalog": (QUOTE_TABLE_PATH, ["product-catalog.json", *TABLE_DERIVED_OUTPUTS]),
+        "queue": (QUOTE_QUEUE_PATH, ["quote-queue.json", "quote-queue-metrics.json", "queue-entities.json"]),
+        "template": (QUOTE_TEMPLATE_PATH, ["staff.json", "dealers.json", "queue-entities.json"]),
+    }
+
+
+def _extractor_inputs():
+    """Extra inputs besides the workbook whose changes invalidate an extractor's outputs."""
+    return {
+        "profit": [DISCOUNT_TIERS_PATH, SCHEMA_PATH],
+        "catalog": [DISCOUNT_TIERS_PATH, SCHEMA_PATH],
+        "queue": [SCHEMA_PATH],
+        "template": [SCHEMA_PATH],
+    }
+
+
+EXTRACTOR_SOURCES = _extractor_sources()
+EXTRACTOR_INPUTS = _extractor_inputs()
+
+
+def configure_paths(src_dir=None, out_dir=None, table=None, queue=None, template=None, schema=None):
+    """
+    Point the extractor at other workbooks / output folder / schema file.
+
+    Workbooks default to their usual file names inside src_dir. Everything
+    derived from the paths (manifest, queue state, EXTRACTOR_SOURCES) is
+    recomputed. Pool workers get the same settings via current_paths().
+    """
+    global SRC_DIR, OUT_DIR, QUOTE_TABLE_PATH, QUOTE_QUEUE_PATH, QUOTE_TEMPLATE_PATH
+    global MANIFEST_PATH, QUEUE_STATE_PATH, SCHEMA_PATH, _sheet_schemas
+    global EXTRACTOR_SOURCES, EXTRACTOR_INPUTS
+    SRC_DIR = src_dir or SRC_DIR
+    OUT_DIR = out_dir or OUT_DIR
+    QUOTE_TABLE_PATH = table or os.path.join(SRC_DIR, QUOTE_TABLE_FILE)
+    QUOTE_QUEUE_PATH = queue or os.path.join(SRC_DIR, QUOTE_QUEUE_FILE)
+    QUOTE_TEMPLATE_PATH = template or os.path.join(SRC_DIR, QUOTE_TEMPLATE_FILE)
+    MANIFEST_PATH = os.path.join(OUT_DIR, ".extract-manifest.json")
+    QUEUE_STATE_PATH = os.path.join(OUT_DIR, ".quote-queue-state.json")
+    if schema and schema != SCHEMA_PATH:
+        SCHEMA_PATH = schema
+        _sheet_schemas = None
+    EXTRACTOR_SOURCES = _extractor_sources()
+    EXTRACTOR_INPUTS = _extractor_inputs()
+
+
+def current_paths():
+    """The configure_paths() keyword arguments that reproduce the current settings."""
+    return {
+        "src_dir": SRC_DIR,
+        "out_dir": OUT_DIR,
+        "table": QUOTE_TABLE_PATH,
+        "queue": QUOTE_QUEUE_PATH,
+        "template": QUOTE_TEMPLATE_PATH,
+        "schema": SCHEMA_PATH,
+    }
+
+
+def load_manifest():
+    """Load the manifest from the last run; empty if missing or unreadable."""
+    text = _read_text(MANIFEST_PATH)
+    if text is None:
+        return {"sources": {}}
+    try:
+        return json.loads(text)
+    except ValueError:
+        return {"sources": {}}
+
+
+def save_manifest(manifest):
+    write_json_document(manifest, MANIFEST_PATH)
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint_source(path, previous=None):
+    """
+    Return the manifest entry for a source workbook.
+
+    The content hash is only recomputed when size or mtime moved since the
+    previous entry, so an untouched workbook costs a single stat().
+    """
+    st = os.stat(path)
+    entry = {
+        "path": path,
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "parserVersion": PARSER_VERSION,
+    }
+    if previous and previous.get("size") == st.st_size and previous.get("mtime") == st.st_mtime:
+        entry["sha256"] = previous.get("sha256")
+    else:
+        entry["sha256"] = _file_sha256(path)
+    return entry
+
+
+def plan_extraction(manifest, force=False):
+    """
+    Decide which extractors need to run.
+
+    An extractor is skipped when the hashes of its source workbook and extra
+    inputs (EXTRACTOR_INPUTS) plus the parser version match the manifest and
+    every output file it writes still exists. Returns (names_to_run,
+    new_manifest); save new_manifest only after a successful run.
+    """
+    previous = manifest.get("sources", {})
+    sources = {}
+    for name, (path, _) in EXTRACTOR_SOURCES.items():
+        for input_path in [path] + EXTRACTOR_INPUTS.get(name, []):
+            if input_path not in sources and os.path.exists(input_path):
+                sources[input_path] = fingerprint_source(input_path, previous.get(input_path))
+
+    def input_unchanged(path):
+        prev = previous.get(path)
+        current = sources.get(path)
+        if prev is None or current is None:
+            return prev is current
+        return (
+            prev.get("sha256") == current["sha256"]
+            and prev.get("parserVersion") == PARSER_VERSION
+        )
+
+    names = []
+    for name, (path, outputs) in EXTRACTOR_SOURCES.items():
+        unchanged = (
+            all(input_unchanged(p) for p in [path] + EXTRACTOR_INPUTS.get(name, []))
+            and all(os.path.exists(os.path.join(OUT_DIR, out)) for out in outputs)
+        )
+        if force or not unchanged:
+            names.append(name)
+
+    return names, {"sources": sources}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# PARALLEL EXTRACTION (--jobs N)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+_EXTRACTORS = {
+    "profit": extract_profit_analysis,
+    "catalog": extract_product_catalog,
+    "queue": extract_quote_queue,
+    "template": extract_template_dropdowns,
+}
+
+
+def _run_extract_job(name, args, reader, profile=(False, False), paths=None):
+    """
+    Pool worker: run one extractor with its own session (handles can't cross
+    processes). Returns (result, open_costs, profiler stats); profile is the
+    parent's (enabled, trace_memory) so stage timings are collected here too,
+    and paths its current_paths() (a spawned worker re-imports the defaults).
+    """
+    if paths:
+        configure_paths(**paths)
+    PROFILER.configure(*profile)
+    with WorkbookSession(reader) as session, PROFILER.extractor(name):
+        result = _EXTRACTORS[name](session, *args)
+        if name in ("profit", "catalog"):
+            # Layout record classes are built at runtime, so they can't be
+            # unpickled by the parent (generators can't be pickled at all)
+            result = [record._asdict() for record in result]
+        elif name != "template":
+            result = list(result)
+    return result, session.open_costs, PROFILER.take()
+
+
+def _catalog_chunks(n_chunks, first_row, last_row):
+    """Split TableX rows first_row..last_row into n_chunks contiguous (min_row, max_row) ranges."""
+    total = last_row - first_row + 1
+    size = -(-total // n_chunks)
+    return [
+        (start, min(start + size - 1, last_row))
+        for start in range(first_row, last_row + 1, size)
+    ]
+
+
+def _catalog_last_row(reader):
+    """The last TableX row worth parsing (see _key_max_row); None reads to the end."""
+    schema = sheet_schemas()["catalog"]
+    with WorkbookSession(reader) as session:
+        return _key_max_row(session, session.layout(QUOTE_TABLE_PATH, schema), schema)
+
+
+def run_parallel(jobs, names, reader="iterparse", queue_delta=False):
+    """
+    Run the named extractors in a process pool and write the outputs from this process.
+
+    The TableX sheet is split into `jobs` row-range chunks that are parsed
+    concurrently and concatenated back in row order, so each output file is
+    byte-for-byte identical to the serial run. Each chunk still inflates the
+    sheet from the top; the streaming reader only regex-scans those bytes
+    (_RowSeek), but --dom and --openpyxl parse them, so with those readers
+    a late chunk costs about as much as reading the sheet up to its end.
+
+    Returns (counts, open_costs) with counts keyed by extractor name, like the
+    serial parse_* return values.
+
+    With queue_delta the queue runs in this process after the pool, since it
+    only decodes the tail of the sheet and appends to the existing output.
+    """
+    print(f"\nRunning extractors in a pool of {jobs} processes...")
+    open_costs = {}
+    results = {}
+    pool_names = [name for name in names if not (queue_delta and name == "queue")]
+    profile = (PROFILER.enabled, PROFILER.trace_memory)
+    paths = current_paths()
+    from concurrent.futures import ProcessPoolExecutor  # ~30 ms to import; only pools need it
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Submit the big TableX chunks first so they start before the small sheets
+        catalog_futures = []
+        if "catalog" in pool_names:
+            last_row = _catalog_last_row(reader)
+            first_row = sheet_schemas()["catalog"].get("firstRow", 1)
+            chunks = _catalog_chunks(jobs, first_row, last_row) if last_row else [(first_row, None)]
+            catalog_futures = [
+                pool.submit(_run_extract_job, "catalog", chunk, reader, profile, paths)
+                for chunk in chunks
+            ]
+        futures = {
+            name: pool.submit(_run_extract_job, name, (), reader, profile, paths)
+            for name in pool_names if name != "catalog"
+        }
+
+        for name, future in futures.items():
+            results[name], costs, stats = future.result()
+            _merge_open_costs(open_costs, costs)
+            PROFILER.merge(stats)
+        if catalog_futures:
+            catalog = []
+            for future in catalog_futures:
+                records, costs, stats = future.result()
+                catalog.extend(records)
+                _merge_open_costs(open_costs, costs)
+                PROFILER.merge(stats)
+            results["catalog"] = catalog
+
+    counts = {}
+    outputs = {
+        "profit": "profit-analysis.json",
+        "catalog": "product-catalog.json",
+        "queue": "quote-queue.json",
+    }
+    for name, filename in outputs.items():
+        if name in results:
+            with PROFILER.extractor(name):
+                counts[name] = write_json(results[name], filename)
+    if "template" in results:
+        staff, dealers = results["template"]
+        with PROFILER.extractor("template"):
+            counts["template"] = (write_json(staff, "staff.json"), write_json(dealers, "dealers.json"))
+    if queue_delta and "queue" in names:
+        queue_counts, costs = run_serial(["queue"], reader=reader, queue_delta=True)
+        counts.update(queue_counts)
+        _merge_open_costs(open_costs, costs)
+    return counts, open_costs
+
+
+def _merge_open_costs(total, costs):
+    for path, seconds in costs.items():
+        total[path] = total.get(path, 0.0) + seconds
+
+
+def run_serial(names, reader="iterparse", queue_delta=False, session=None):
+    """
+    Run the named parse_* stages in this process over one shared session.
+
+    Pass a session to reuse its open workbooks (--watch keeps one across
+    cycles); it is left open. Otherwise a new one is opened and closed here.
+    """
+    parsers = {
+        "profit": parse_profit_analysis,
+        "catalog": parse_product_catalog,
+        "queue": parse_quote_queue_delta if queue_delta else parse_quote_queue,
+        "template": parse_template_dropdowns,
+    }
+    counts = {}
+    with nullcontext(session) if session else WorkbookSession(reader) as session:
+        for name in names:
+            with PROFILER.extractor(name):
+                counts[name] = parsers[name](session)
+    return counts, session.open_costs
+
+
+def print_summary(counts, open_costs):
+    """Print the SUMMARY block; extractors missing from counts were skipped."""
+    skipped = "skipped (source unchanged)"
+    template = counts.get("template")
+
+    def line(label, name, value):
+        print(f"  {label:<24} : {value if name in counts else skipped}")
+
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    line("profit-analysis.json", "profit", f"{counts.get('profit', 0):,} rows")
+    line("product-catalog.json", "catalog", f"{counts.get('catalog', 0):,} rows")
+    line("quote-queue.json", "queue", f"{counts.get('queue', 0):,} rows")
+    line("staff.json", "template", f"{template[0] if template else 0} staff members")
+    line("dealers.json", "template", f"{template[1] if template else 0} dealers")
+    line("quote-queue-metrics.json", "metrics", f"{counts.get('metrics', 0):,} quotes summarized")
+    line("sku-index.json", "index", f"{counts.get('index', 0):,} SKUs indexed")
+    line("margin-rollups.json", "rollups", f"{counts.get('rollups', 0):,} groups")
+    line("cost-model-check.json", "costModel", f"{counts.get('costModel', 0):,} rows disagree")
+    line("queue-entities.json", "entities", f"{counts.get('entities', 0):,} dealers resolved")
+    if open_costs:
+        print("\nWorkbook open cost:")
+        for path, seconds in open_costs.items():
+            print(f"  {os.path.basename(path):<32} {seconds:.2f}s")
+    print(f"\nAll files written to: {OUT_DIR}")
+    print("=" * 60)
+
+
+def write_derived_outputs(args, names, counts):
+    """Metrics, entities, SKU index, rollups and cost check, then the optional outputs for a finished run."""
+    if "queue" in counts:
+        with PROFILER.extractor("metrics"):
+            counts["metrics"] = parse_queue_metrics()
+    if "profit" in counts or "catalog" in counts:
+        with PROFILER.extractor("index"):
+            counts["index"] = parse_sku_index()
+        with PROFILER.extractor("rollups"):
+            counts["rollups"] = parse_margin_rollups()
+        with PROFILER.extractor("costModel"):
+            counts["costModel"] = parse_cost_model_check()
+    if "queue" in counts or "template" in counts:
+        with PROFILER.extractor("entities"):
+            counts["entities"] = parse_queue_entities()
+    if args.what_if:
+        with PROFILER.extractor("whatIf"):
+            run_what_if(args.what_if)
+    if args.columnar:
+        print("\nWriting columnar outputs...")
+        with PROFILER.extractor("columnar"):
+            for name in names:
+                for filename in EXTRACTOR_SOURCES[name][1]:
+                    if filename in COLUMNAR_OUTPUTS:
+                        write_columnar(filename, compress=args.gzip)
+    if args.sqlite:
+        with PROFILER.extractor("sqlite"):
+            export_sqlite(args.sqlite, mode=args.sqlite_mode)
+    with PROFILER.extractor("changes"):
+        write_changesets()
+
+
+def finish_run(args, counts, open_costs):
+    """Print the summary and write the --profile report."""
+    print_summary(counts, open_costs)
+    if args.profile:
+        with open(args.profile, "w") as f:
+            json.dump(PROFILER.report(counts), f, indent=2)
+        print(f"Profile report written to: {args.profile}")
+
+
+def run_extraction(args, reader, force=False, session=None):
+    """
+    One pass of the pipeline: plan against the manifest, run the extractors
+    whose inputs changed, rebuild the derived outputs and save the manifest.
+
+    Returns the counts keyed by extractor name ({} if nothing changed).
+    session is reused by the serial path, see run_serial.
+    """
+    names, manifest = plan_extraction(load_manifest(), force=force)
+    if not names:
+        save_manifest(manifest)  # keep refreshed mtimes so the next run skips hashing
+        print("\nAll source workbooks unchanged — nothing to extract.")
+        if args.what_if:
+            run_what_if(args.what_if)
+        if args.sqlite:
+            export_sqlite(args.sqlite, mode=args.sqlite_mode)
+        return {}
+
+    if args.jobs and args.jobs > 1:
+        counts, open_costs = run_parallel(
+            args.jobs, names, reader=reader, queue_delta=args.queue_delta
+        )
+    else:
+        counts, open_costs = run_serial(
+            names, reader=reader, queue_delta=args.queue_delta, session=session
+        )
+    write_derived_outputs(args, names, counts)
+    save_manifest(manifest)
+    finish_run(args, counts, open_costs)
+    return counts
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# BATCH MODE (--batch GLOB) — merge many workbooks, e.g. yearly archives
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# Every matching workbook is one pool job, classified by its sheets (Quote
+# Table, Quote Template, otherwise a Quote Queue). Records are tagged with
+# "source" (the file name) and merged into the usual output files.
+#
+# Sources are ordered oldest first by the year in the file name (file mtime
+# when there is none, and as the tiebreak), which is also the year a queue's
+# rows start in before any section header. Duplicates are only resolved
+# across sources, so a batch of one workbook writes what a plain run does:
+# the nth record with a key in a later workbook replaces the nth in an
+# earlier one, and repeats within a file all survive.
+#   - quote-queue.json      keyed on real quote numbers (QUOTE_NUMBER_RE, e.g.
+#                           24.MAF.3182024); placeholders ("Email Quote",
+#                           "NONE", "PO / SO #9901") are all kept
+#   - product-catalog.json  keyed on SKU; the record with the later DATE
+#                           (column A) wins, the later workbook on a tie
+#   - staff.json / dealers.json  keyed on name
+# profit-analysis.json is a quoting history and keeps every row.
+
+QUOTE_NUMBER_RE = re.compile(r"\d{2}\.[A-Za-z]")
+
+BATCH_DEDUPE = {  # dataset: (key field, pattern a real key matches or None, date field or None)
+    "catalog": ("sku", None, "date"),
+    "queue": ("quoteNumber", QUOTE_NUMBER_RE, None),
+    "staff": ("name", None, None),
+    "dealers": ("name", None, None),
+}
+
+_FILE_YEAR_RE = re.compile(r"(?<!\d)(20\d\d)(?!\d)")
+
+
+def batch_sources(patterns):
+    """Expand globs to [(path, year)] oldest first, skipping Excel's ~$ lock files."""
+    import glob
+
+    found = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.expanduser(pattern)):
+            name = os.path.basename(path)
+            if name.startswith("~$") or not name.lower().endswith(".xlsx"):
+                continue
+            found.add(os.path.abspath(path))
+    sources = []
+    for path in found:
+        mtime = os.path.getmtime(path)
+        year_match = _FILE_YEAR_RE.search(os.path.basename(path))
+        year = int(year_match.group(1)) if year_match else datetime.fromtimestamp(mtime).year
+        sources.append((year, mtime, path))
+    return [(path, year) for year, _, path in sorted(sources)]
+
+
+def _run_batch_job(path, year, reader, profile, paths):
+    """
+    Pool worker: parse every dataset one workbook holds. Returns (kind,
+    {dataset: records}, open_costs, profiler stats).
+    """
+    configure_paths(**{**paths, "table": path, "queue": path, "template": path})
+    PROFILER.configure(*profile)
+    source = os.path.basename(path)
+    datasets = {}
+    with WorkbookSession(reader) as session:
+        sheets = {name for name, _ in session.sheet_parts(path)}
+        if sheet_schemas()["profit"]["sheet"] in sheets or sheet_schemas()["catalog"]["sheet"] in sheets:
+            kind = "table"
+            if sheet_schemas()["profit"]["sheet"] in sheets:
+                with PROFILER.extractor("profit"):
+                    datasets["profit"] = list(extract_profit_analysis(session))
+            if sheet_schemas()["catalog"]["sheet"] in sheets:
+                with PROFILER.extractor("catalog"):
+                    datasets["catalog"] = list(extract_product_catalog(session))
+        elif sheet_schemas()["template"]["sheet"] in sheets:
+            kind = "template"
+            with PROFILER.extractor("template"):
+                datasets["staff"], datasets["dealers"] = extract_template_dropdowns(session)
+        else:
+            kind = "queue"
+            with PROFILER.extractor("queue"):
+                datasets["queue"] = [record for record, _ in iter_quote_queue(session, start_year=year)]
+    datasets = {
+        name: [{**record._asdict(), "source": source} for record in records]
+        for name, records in datasets.items()
+    }
+    return kind, datasets, session.open_costs, PROFILER.take()
+
+
+def dedupe_latest(records, field, pattern=None, date_field=None):
+    """
+    Resolve records that share a value of field across sources (records run
+    oldest source first). A value's nth occurrence in a source replaces its
+    nth occurrence in an earlier one, in the position of the first; with
+    date_field, only if its date is not older (missing dates are oldest).
+    Records with an empty value, or one pattern does not match, are all kept.
+    Returns (records, Counter of dropped records per value).
+    """
+    kept, position, dropped = [], {}, Counter()
+    occurrences = Counter()
+    for record in records:
+        value = record.get(field)
+        if not value or (pattern is not None and not pattern.match(value)):
+            kept.append(record)
+            continue
+        occurrences[record.get("source"), value] += 1
+        key = (value, occurrences[record.get("source"), value])
+        if key not in position:
+            position[key] = len(kept)
+            kept.append(record)
+            continue
+        dropped[value] += 1
+        current = kept[position[key]]
+        if date_field is None or (record.get(date_field) or "") >= (current.get(date_field) or ""):
+            kept[position[key]] = record
+    return kept, dropped
+
+
+def run_batch(args, reader):
+    """Parse every workbook matching args.batch in a process pool and write merged outputs."""
+    sources = batch_sources(args.batch)
+    if not sources:
+        print(f"\nNo workbooks match {' '.join(args.batch)}")
+        return {}
+    jobs = min(args.jobs or os.cpu_count() or 1, len(sources))
+    print(f"\nBatch: {len(sources)} workbooks in a pool of {jobs} processes...")
+
+    merged = {name: [] for name in ("profit", "catalog", "queue", "staff", "dealers")}
+    open_costs = {}
+    profile = (PROFILER.enabled, PROFILER.trace_memory)
+    paths = current_paths()
+    from concurrent.futures import ProcessPoolExecutor  # ~30 ms to import; only pools need it
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            (path, pool.submit(_run_batch_job, path, year, reader, profile, paths))
+            for path, year in sources
+        ]
+        for path, future in futures:  # source order, so merged lists run oldest → newest
+            kind, datasets, costs, stats = future.result()
+            found = ", ".join(f"{len(records):,} {name}" for name, records in datasets.items())
+            print(f"  {os.path.basename(path):<40} {kind:<9} {found}")
+            for name, records in datasets.items():
+                merged[name].extend(records)
+            _merge_open_costs(open_costs, costs)
+            PROFILER.merge(stats)
+
+    print("\nMerging...")
+    for name, (field, pattern, date_field) in BATCH_DEDUPE.items():
+        merged[name], dropped = dedupe_latest(merged[name], field, pattern, date_field)
+        if dropped:
+            top = ", ".join(f"{value} ×{n}" for value, n in dropped.most_common(3))
+            print(f"  {name}: {sum(dropped.values()):,} superseded records dropped for "
+                  f"{len(dropped):,} {field} values (most: {top})")
+
+    counts = {}
+    outputs = [
+        ("profit", "profit-analysis.json"),
+        ("catalog", "product-catalog.json"),
+        ("queue", "quote-queue.json"),
+        ("staff", "staff.json"),
+        ("dealers", "dealers.json"),
+    ]
+    for name, filename in outputs:
+        if merged[name]:
+            with PROFILER.extractor("template" if name in ("staff", "dealers") else name):
+                counts[name] = write_json(merged[name], filename)
+    if "staff" in counts or "dealers" in counts:
+        counts["template"] = (counts.pop("staff", 0), counts.pop("dealers", 0))
+
+    names = [name for name in EXTRACTOR_SOURCES if name in counts]
+    write_derived_outputs(args, names, counts)
+    save_manifest({"sources": {}})  # merged outputs: the next single-workbook run re-extracts
+    finish_run(args, counts, open_costs)
+    return counts
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# WATCH MODE (--watch) — re-extract whenever a source workbook is saved
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#
+# The source files are polled with os.stat (no inotify dependency, and it
+# works the same on macOS and on network shares). Excel saves by writing a
+# temp file in the folder and renaming it over the workbook, with a ~$ lock
+# file alongside; only the known source paths are watched, so those never
+# trigger a run. A changed file must then keep the same size and mtime for
+# WATCH_SETTLE seconds, and open as a zip, before it counts as saved.
+#
+# One WorkbookSession lives for the whole watch: a changed workbook is
+# invalidated, everything else stays open with its shared strings decoded
+# (e.g. when only discount-tiers.json changed), and the manifest decides
+# which extractors re-run. A cycle that fails (a missing sheet, a value the
+# parser chokes on) is logged and the watch goes on. Each output file is
+# swapped in atomically on its own, so outputs written before the failure are
+# new and the rest old; the log lists the new ones. The manifest is not
+# saved, so the next save re-runs the whole cycle and brings them level.
+
+WATCH_INTERVAL = 1.0  # seconds between polls
+WATCH_SETTLE = 2.0    # seconds a changed file must hold still
+
+
+def _watched_paths():
+    """Every source workbook and extra input the manifest tracks."""
+    paths = {path for path, _ in EXTRACTOR_SOURCES.values()}
+    for inputs in EXTRACTOR_INPUTS.values():
+        paths.update(inputs)
+    return sorted(paths)
+
+
+def _stat_signature(path):
+    """(size, mtime_ns) of path, or None while it's missing (mid-rename)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _file_ready(path):
+    """A settled workbook must also be a complete zip; other inputs just need to exist."""
+    if path.endswith(".xlsx"):
+        return zipfile.is_zipfile(path)
+    return os.path.exists(path)
+
+
+def watch(args, reader, interval=WATCH_INTERVAL, settle=WATCH_SETTLE):
+    """Extract once, then poll the sources and re-extract after each save until Ctrl-C."""
+    paths = _watched_paths()
+    seen = {path: _stat_signature(path) for path in paths}
+    pending = {}  # path -> (signature, monotonic time it was first seen)
+    cycle = 0
+
+    def run_cycle(changed, force=False):
+        nonlocal cycle
+        cycle += 1
+        session.open_costs.clear()
+        PROFILER.take()  # each cycle's --profile report covers that cycle only
+        started = time.perf_counter()
+        trigger = f" after {', '.join(os.path.basename(p) for p in changed)} changed" if changed else ""
+        AtomicOutput.replaced.clear()
+        try:
+            counts = run_extraction(args, reader, force=force, session=session)
+        except Exception as exc:  # a half-saved workbook, a renamed sheet, a bad value...
+            import traceback  # only a failed cycle needs it
+
+            traceback.print_exc()
+            for path in paths:
+                session.invalidate(path)  # reopen everything on the retry
+            written = sorted({os.path.basename(path) for path in AtomicOutput.replaced})
+            kept = f"already rewritten: {', '.join(written)}" if written else "no outputs were rewritten"
+            print(f"[{datetime.now():%H:%M:%S}] cycle {cycle} failed{trigger}: "
+                  f"{type(exc).__name__}: {exc}; {kept}; retrying after the next save", flush=True)
+            return
+        elapsed = time.perf_counter() - started
+        ran = [name for name in EXTRACTOR_SOURCES if name in counts]
+        what = f"re-extracted {', '.join(ran)}" if ran else "nothing to extract"
+        print(f"[{datetime.now():%H:%M:%S}] cycle {cycle}: {what} in {elapsed:.2f}s{trigger}; "
+              f"watching {len(paths)} files (Ctrl-C to stop)", flush=True)
+
+    with WorkbookSession(reader) as session:
+        run_cycle([], force=args.force)
+        try:
+            while True:
+                time.sleep(interval)
+                now = time.monotonic()
+                for path in paths:
+                    signature = _stat_signature(path)
+                    if signature == seen[path]:
+                        pending.pop(path, None)  # changed back (or a no-op save)
+                    elif path not in pending or pending[path][0] != signature:
+                        pending[path] = (signature, now)  # still being written
+                if not pending or not all(
+                    signature is not None and now - since >= settle and _file_ready(path)
+                    for path, (signature, since) in pending.items()
+                ):
+                    continue
+                changed = sorted(pending)
+                for path in changed:
+                    seen[path] = pending.pop(path)[0]
+                    session.invalidate(path)
+                run_cycle(changed)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# MAIN
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def main(argv=None):
+    """Command-line entry point (scripts/parse-excel.py); argv defaults to sys.argv[1:]."""
+    global WRITE_NDJSON
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract TableX Excel data to JSON.")
+    reader_group = parser.add_mutually_exclusive_group()
+    reader_group.add_argument(
+        "--dom", action="store_true",
+        help="parse raw XML parts with whole-tree ET.parse instead of streaming iterparse",
+    )
+    reader_group.add_argument(
+        "--openpyxl", action="store_true",
+        help="read the Quote Table and Template sheets through openpyxl (needs openpyxl installed)",
+    )
+    parser.add_argument(
+        "--src-dir", metavar="DIR",
+        help=f"folder holding the source workbooks (env TABLEX_SRC_DIR; default {SRC_DIR})",
+    )
+    parser.add_argument(
+        "--out-dir", metavar="DIR",
+        help=f"folder the JSON outputs are written to (env TABLEX_OUT_DIR; default {OUT_DIR})",
+    )
+    parser.add_argument("--quote-table", metavar="XLSX", help=f"Quote Table workbook (default <src-dir>/{QUOTE_TABLE_FILE})")
+    parser.add_argument("--quote-queue", metavar="XLSX", help=f"Quote Queue workbook (default <src-dir>/{QUOTE_QUEUE_FILE})")
+    parser.add_argument("--quote-template", metavar="XLSX", help=f"Quote Template workbook (default <src-dir>/{QUOTE_TEMPLATE_FILE})")
+    parser.add_argument(
+        "--schema", metavar="FILE",
+        help="sheet layout file (default scripts/sheet-schemas.json)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, metavar="N",
+        help="run extractors (and TableX row chunks) in a pool of N processes "
+             "(default 1; with --batch, one per CPU). Chunks skip the rows before "
+             "them unparsed, except under --dom/--openpyxl, where each chunk "
+             "re-parses the sheet from row 1",
+    )
+    parser.add_argument(
+        "--batch", action="append", metavar="GLOB",
+        help="parse every workbook matching GLOB (repeatable) and merge them into the outputs, "
+             "tagging records with their source file",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="re-extract every source even if the manifest says it is unchanged",
+    )
+    parser.add_argument(
+        "--queue-delta", action="store_true",
+        help="append only new Quote Queue rows and write quote-queue.delta.json",
+    )
+    parser.add_argument(
+        "--columnar", action="store_true",
+        help="also write <name>.columnar.json (one array per field, dictionary-encoded strings)",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true",
+        help="gzip the --columnar files (<name>.columnar.json.gz)",
+    )
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help="also write <name>.ndjson (one record per line) in the same streaming pass",
+    )
+    parser.add_argument(
+        "--sqlite", metavar="FILE",
+        help="also load every dataset into the SQLite database FILE (seeder column names)",
+    )
+    parser.add_argument(
+        "--sqlite-mode", choices=SQLITE_MODES, default="replace",
+        help="replace: recreate the tables (default); upsert: update rows in place by key",
+    )
+    parser.add_argument(
+        "--what-if", metavar="FILE",
+        help="reprice the catalog with the cost model under each scenario in FILE "
+             "(freightOutPct, gpm, commission, packagingCost, discountFactor) and write what-if.json",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running: re-extract whenever a source workbook is saved (polls every "
+             f"{WATCH_INTERVAL:g}s, waits {WATCH_SETTLE:g}s for the save to settle)",
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE",
+        help="write per-extractor stage timings and skipped-row counts to FILE (JSON)",
+    )
+    parser.add_argument(
+        "--cprofile", metavar="FILE",
+        help="dump cProfile stats for this process to FILE (read with pstats; workers not included)",
+    )
+    parser.add_argument(
+        "--tracemalloc", metavar="FILE",
+        help="trace allocations, dump a tracemalloc snapshot to FILE, and add per-stage "
+             "peak allocation to the --profile report",
+    )
+    args = parser.parse_args(argv)
+    reader = "dom" if args.dom else "openpyxl" if args.openpyxl else "iterparse"
+    WRITE_NDJSON = args.ndjson
+    configure_paths(
+        src_dir=args.src_dir, out_dir=args.out_dir, table=args.quote_table,
+        queue=args.quote_queue, template=args.quote_template, schema=args.schema,
+    )
+    os.makedirs(OUT_DIR, exist_ok=True)
+    if args.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+    PROFILER.configure(bool(args.profile), trace_memory=bool(args.tracemalloc))
+    if args.cprofile:
+        import cProfile
+
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+
+    print("=" * 60)
+    print("TableX Excel → JSON Data Extraction")
+    print("=" * 60)
+
+    if args.batch:
+        run_batch(args, reader)
+    elif args.watch:
+        watch(args, reader)
+    else:
+        run_extraction(args, reader, force=args.force)
+    if args.cprofile:
+        cprofiler.disable()
+        cprofiler.dump_stats(args.cprofile)
+        print(f"cProfile stats written to: {args.cprofile}")
+    if args.tracemalloc:
+        tracemalloc.take_snapshot().dump(args.tracemalloc)
+        print(f"tracemalloc snapshot written to: {args.tracemalloc}")
+
+
+if __name__ == "__main__":
+    main()